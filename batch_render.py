@@ -0,0 +1,141 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+
+from matplotlib.figure import Figure
+
+from draw_basketball_court import (
+    bubble_sizes,
+    compute_view,
+    draw_half_court,
+    legend_counts,
+    open_shots,
+)
+import zones
+from shot_cube import ShotCube
+from shot_store import ShotStore
+
+# Cube opened once per worker process (memory-mapped, shared page cache)
+_cube = None
+
+
+def _init_worker(cube_dir):
+    global _cube
+    _cube = ShotCube.load(cube_dir, mmap_mode="r")
+
+
+def render_chart(cube, team, season, out_path, level=zones.DEFAULT_LEVEL):
+    """Render one team × season shot chart to out_path without a GUI."""
+    view = compute_view(cube, (team, season, None, None, None, level, None))
+    bubble_max = cube.levels[level].bubble_max
+    grouped = view["grouped"]
+
+    fig = Figure(figsize=(12, 7))
+    ax = fig.add_axes([0.1, 0.1, 0.8, 0.8])
+    draw_half_court(ax)
+    ax.set_title(f"{team} — {season}")
+
+    scatter = ax.scatter(
+        grouped["x"],
+        grouped["y"],
+        s=bubble_sizes(grouped["count"].to_numpy(), max_size=bubble_max),
+        c=grouped["fg"],
+        cmap="viridis",
+        alpha=0.7,
+        zorder=10,
+        vmin=0,
+        vmax=1,
+    )
+    cbar = fig.colorbar(scatter, ax=ax)
+    cbar.set_label("Field Goal Percentage (FG%)")
+
+    # --- Bubble-size legend (shots per zone) ---
+    ref_counts = legend_counts(grouped["count"].to_numpy())
+    if ref_counts.size > 0:
+        handles = [
+            ax.scatter([], [], s=s, color="gray", alpha=0.7, edgecolor="gray")
+            for s in bubble_sizes(ref_counts, max_size=bubble_max)
+        ]
+        ax.legend(
+            handles,
+            [f"{c} shots" for c in ref_counts],
+            title="Shots in Zone",
+            loc="upper right",
+            bbox_to_anchor=(1.32, 1.00),
+            frameon=True,
+        )
+
+    fig.savefig(out_path)
+    return out_path
+
+
+def _render_task(task):
+    team, season, out_path, level = task
+    return render_chart(_cube, team, season, out_path, level)
+
+
+def chart_path(out_dir, team, season, fmt):
+    safe_team = "".join(c if c.isalnum() else "_" for c in team)
+    return os.path.join(out_dir, f"{safe_team}_{season}.{fmt}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a shot chart for every team and season without a GUI."
+    )
+    parser.add_argument("--out-dir", default="charts", help="output folder (default: charts)")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="image format")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.dirname(os.path.abspath(__file__)),
+        help="folder with clean_shots_with_zones.parquet or shot_store/ (default: project root)",
+    )
+    parser.add_argument("--teams", nargs="*", help="only render these teams")
+    parser.add_argument("--seasons", nargs="*", type=int, help="only render these seasons")
+    parser.add_argument(
+        "--zones",
+        default=zones.DEFAULT_LEVEL,
+        choices=[f"{width} ft" for width in zones.grid_widths] + [zones.AREA_LEVEL],
+        help=f"zone size (default: {zones.DEFAULT_LEVEL})",
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    shots = open_shots(args.data_dir)
+    cube = shots.cube() if isinstance(shots, ShotStore) else ShotCube(shots)
+
+    tasks = [
+        (team, season, chart_path(args.out_dir, team, season, args.format), args.zones)
+        for team, season in cube.team_seasons()
+        if (not args.teams or team in args.teams)
+        and (not args.seasons or season in args.seasons)
+    ]
+
+    # Workers map the saved cube instead of receiving a pickled copy per task;
+    # a shot store already holds one on disk
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if isinstance(shots, ShotStore):
+            cube_dir = shots.cube_dir
+        else:
+            cube_dir = tmp_dir
+            cube.save(cube_dir)
+        with ProcessPoolExecutor(
+            max_workers=args.workers, initializer=_init_worker, initargs=(cube_dir,)
+        ) as pool:
+            for out_path in pool.map(_render_task, tasks, chunksize=4):
+                print(f"Saved {out_path}")
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(tasks)} charts in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import data_cleaning
+import zones
+from data_cleaning import map_periods
+from data_sources import SyntheticSource
+from draw_basketball_court import TeamSelector, load_shots, surface_bandwidth
+from shot_store import ShotStore, write_store
+
+
+def make_quarters(n_rows, seed=0):
+    """Raw QUARTER values with roughly the real share of overtime shots."""
+    rng = np.random.default_rng(seed)
+    quarters = rng.choice([1, 2, 3, 4, 5, 6], size=n_rows, p=[0.24, 0.24, 0.24, 0.24, 0.03, 0.01])
+    return pd.Series(quarters)
+
+
+def best_time(func, repeat):
+    """Best wall-clock time of `repeat` calls to func()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_periods(n_rows, repeat=3):
+    """
+    Time the QUARTER -> period mapping and a single-period filter, row-wise
+    (the old apply + astype(str) path) versus vectorized categorical.
+    """
+    quarter = make_quarters(n_rows)
+
+    old_periods = quarter.apply(lambda x: x if x <= 4 else "OT")
+    new_periods = pd.Series(map_periods(quarter))
+    assert (old_periods.astype(str) == new_periods.astype(str)).all()
+
+    results = {
+        "map (apply)": best_time(lambda: quarter.apply(lambda x: x if x <= 4 else "OT"), repeat),
+        "map (vectorized)": best_time(lambda: map_periods(quarter), repeat),
+        "filter (astype(str))": best_time(lambda: old_periods.astype(str) == "2", repeat),
+        "filter (categorical)": best_time(lambda: new_periods == "2", repeat),
+    }
+
+    per_million = 1_000_000 / n_rows
+    print(f"QUARTER periods, {n_rows:,} rows (best of {repeat}):")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * per_million * 1000:9.2f} ms per million rows")
+    return results
+
+
+def bench_aggregation(n_rows, repeat=3, seed=0):
+    """
+    Time per-zone attempts/makes totals: pandas groupby versus the
+    zones.zone_totals() bincount kernel, on random fine-zone codes.
+    """
+    rng = np.random.default_rng(seed)
+    zone = rng.integers(0, zones.n_zones, size=n_rows)
+    made = rng.random(n_rows) < 0.45
+    df = pd.DataFrame({"zone": zone, "SHOT_MADE": made})
+
+    def groupby():
+        return df.groupby("zone")["SHOT_MADE"].agg(["size", "sum"])
+
+    grouped = groupby()
+    attempts, makes = zones.zone_totals(zone, zones.n_zones, makes=made)
+    assert (attempts[grouped.index] == grouped["size"]).all()
+    assert (makes[grouped.index] == grouped["sum"]).all()
+
+    results = {
+        "groupby": best_time(groupby, repeat),
+        "bincount": best_time(lambda: zones.zone_totals(zone, zones.n_zones, makes=made), repeat),
+    }
+
+    per_million = 1_000_000 / n_rows
+    print(f"Zone totals, {n_rows:,} rows (best of {repeat}):")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * per_million * 1000:9.2f} ms per million rows")
+    return results
+
+
+class StageTimer:
+    """Runs benchmark stages, recording wall time and (optionally) peak traced memory."""
+
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.stages = {}
+
+    def run(self, name, func, *args, **kwargs):
+        if self.track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        peak_mb = None
+        if self.track_memory:
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+        self.stages[name] = {"seconds": seconds, "peak_mb": peak_mb}
+        mem = f"{peak_mb:9.1f} MB" if peak_mb is not None else ""
+        print(f"  {name:<28} {seconds * 1000:10.1f} ms {mem}")
+        return result
+
+
+def filter_matrix(selector):
+    """Filter combinations timed through update_plot: teams × quarters × positions."""
+    seasons = [selector.min_year, selector.max_year]
+    quarters = ["All Quarters", "1", "OT"]
+    positions = ["All Positions", selector.positions[1], selector.positions[-1]]
+    return [
+        (team, season, quarter, position)
+        for team in selector.teams[:3]
+        for season in seasons
+        for quarter in quarters
+        for position in positions
+    ]
+
+
+def bench_slices(shots, store, repeat=3):
+    """
+    Time fetching every team-season's shot locations: boolean masks over
+    the whole frame versus a slice from the store's offset index.
+    """
+    pairs = store.cube().team_seasons()
+    team_col, season_col = shots["TEAM_NAME"], shots["SEASON_1"]
+
+    def scan():
+        for team, season in pairs:
+            shots["LOC_X"][(team_col == team) & (season_col == season)].to_numpy()
+
+    def offsets():
+        for team, season in pairs:
+            np.asarray(store.column("LOC_X")[store.rows(team, season)])
+
+    results = {
+        "mask scan": best_time(scan, repeat) / len(pairs),
+        "offset slice": best_time(offsets, repeat) / len(pairs),
+    }
+    print(f"Team-season fetch, {len(pairs)} slices (best of {repeat}):")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * 1e6:9.1f} µs per slice")
+    return results
+
+
+def bench_import(repeat=3):
+    """Best time to import the viewer module in a fresh interpreter."""
+    code = "import matplotlib; matplotlib.use('Agg'); import draw_basketball_court"
+    seconds = best_time(
+        lambda: subprocess.run([sys.executable, "-c", code], check=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__))),
+        repeat,
+    )
+    print(f"  {'viewer.import':<28} {seconds * 1000:10.1f} ms")
+    return {"seconds": seconds, "peak_mb": None}
+
+
+def bench_pipeline(n_rows, seed, timer):
+    """Time every cleaning stage, the viewer load, TeamSelector setup and redraws."""
+    source_dir = SyntheticSource(n_rows, seed=seed).path()
+    files = data_cleaning.season_files(source_dir)
+
+    print(f"Pipeline, {n_rows:,} synthetic rows:")
+    raw = timer.run("clean.load", lambda: pd.concat(
+        [pd.read_csv(f) for f in files], ignore_index=True
+    ))
+
+    df = raw
+    for name, step in data_cleaning.cleaning_steps:
+        df = timer.run(f"clean.{name}", step, df)
+    del raw
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        parquet_path = os.path.join(out_dir, "clean_shots_with_zones.parquet")
+        timer.run("clean.write", df.to_parquet, parquet_path, index=False)
+        del df
+
+        shots = timer.run("viewer.load", load_shots, out_dir)
+
+        store_shots = pd.read_parquet(parquet_path, columns=data_cleaning.store_columns)
+        store_dir = os.path.join(out_dir, "shot_store")
+        timer.run("store.write", write_store, store_shots, store_dir)
+        slices = bench_slices(store_shots, ShotStore(store_dir))
+        del store_shots
+
+    fig = plt.figure(figsize=(12, 7))
+    ax = plt.axes([0.1, 0.15, 0.8, 0.75])
+    # No view cache or prefetching, so every update computes its view
+    selector = timer.run(
+        "viewer.init", TeamSelector, shots, fig, ax, cache_mb=0, prefetch=False
+    )
+    timer.run("viewer.first_draw", fig.canvas.draw)
+
+    redraw_times = []
+    for team, season, quarter, position in filter_matrix(selector):
+        selector.current_year = season
+        start = time.perf_counter()
+        selector.update_plot(team_name=team, quarter=quarter, position=position)
+        redraw_times.append(time.perf_counter() - start)
+
+    # Player charts, spread over the whole player list
+    player_times = []
+    for player in selector.players[1::max(1, len(selector.players) // 50)]:
+        start = time.perf_counter()
+        selector.update_plot(player=player)
+        player_times.append(time.perf_counter() - start)
+
+    # Smoothed surfaces for the same filters (team charts again)
+    selector.update_plot(player="All Players")
+    selector.toggle_render_mode()
+    surface_times = []
+    for team, season, quarter, position in filter_matrix(selector):
+        selector.current_year = season
+        start = time.perf_counter()
+        selector.update_plot(team_name=team, quarter=quarter, position=position)
+        surface_times.append(time.perf_counter() - start)
+
+    # League-wide, all seasons: the smoothing only sees the binned grid
+    cube = selector.cube
+    league_attempts = cube.league_zone_attempts.sum(axis=(0, 1))
+    league_makes = cube.league_zone_makes.sum(axis=(0, 1))
+    timer.run(
+        "surface.league_all_seasons",
+        lambda: [
+            zones.smooth_zones(values, surface_bandwidth(cube.levels[zones.DEFAULT_LEVEL]))
+            for values in (league_attempts, league_makes)
+        ],
+    )
+    plt.close(fig)
+
+    timer.stages["viewer.update_plot"] = {
+        "seconds": float(np.median(redraw_times)),
+        "max_seconds": float(np.max(redraw_times)),
+        "runs": len(redraw_times),
+        "peak_mb": None,
+    }
+    print(
+        f"  {'viewer.update_plot (median)':<28} {np.median(redraw_times) * 1000:10.1f} ms"
+        f"  (max {np.max(redraw_times) * 1000:.1f} ms over {len(redraw_times)} filters)"
+    )
+
+    timer.stages["viewer.player_switch"] = {
+        "seconds": float(np.median(player_times)),
+        "max_seconds": float(np.max(player_times)),
+        "runs": len(player_times),
+        "peak_mb": None,
+    }
+    print(
+        f"  {'viewer.player_switch (median)':<28} {np.median(player_times) * 1000:10.1f} ms"
+        f"  (max {np.max(player_times) * 1000:.1f} ms over {len(player_times)} players)"
+    )
+
+    timer.stages["viewer.surface_update"] = {
+        "seconds": float(np.median(surface_times)),
+        "max_seconds": float(np.max(surface_times)),
+        "runs": len(surface_times),
+        "peak_mb": None,
+    }
+    print(
+        f"  {'viewer.surface_update (median)':<28} {np.median(surface_times) * 1000:10.1f} ms"
+        f"  (max {np.max(surface_times) * 1000:.1f} ms over {len(surface_times)} filters)"
+    )
+    return slices
+
+
+def compare(results, baseline_path, threshold):
+    """Print stages that got slower than threshold × baseline; return their names."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for name, stage in results["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if old is None or not old["seconds"]:
+            continue
+        ratio = stage["seconds"] / old["seconds"]
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"  {name:<28} {ratio:6.2f}x {flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cleaning, loading, aggregation and redraws.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows of synthetic input")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repetitions for micro-benchmarks")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak_mb)")
+    parser.add_argument("--output", default="bench_results.json", help="where to write results")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25,
+        help="flag stages slower than this multiple of the baseline (default: 1.25)",
+    )
+    args = parser.parse_args()
+
+    timer = StageTimer(track_memory=not args.no_memory)
+    slices = bench_pipeline(args.rows, args.seed, timer)
+    timer.stages["viewer.import"] = bench_import(args.repeat)
+    periods = bench_periods(args.rows, args.repeat)
+    aggregation = bench_aggregation(args.rows, args.repeat, args.seed)
+
+    results = {
+        "meta": {
+            "rows": args.rows,
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+            "machine": platform.machine(),
+        },
+        "stages": timer.stages,
+        "periods": periods,
+        "aggregation": aggregation,
+        "slices": slices,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {args.output}")
+
+    if args.compare:
+        print(f"Compared with {args.compare}:")
+        if compare(results, args.compare, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
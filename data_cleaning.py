@@ -1,27 +1,19 @@
-import kagglehub
-import pandas as pd
+import argparse
+import functools
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-# load in data
-path = kagglehub.dataset_download("mexwell/nba-shots")
-
-print("Dataset folder:", path)
-print("Files in folder:", os.listdir(path))
-all_files = [f for f in os.listdir(path) if f.endswith(".csv")]
-
-df_list = []
-for file in all_files:
-    file_path = os.path.join(path, file)
-    print(f"Loading {file}...")
-    temp_df = pd.read_csv(file_path)
-    df_list.append(temp_df)
-
-# Combine all season files into a single dataset
-df = pd.concat(df_list, ignore_index=True)
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-print(df.shape)
-print(df.head())
-print(df.info())
+import tracing
+import zones
+from data_sources import make_source
+from shot_store import STORE_NAME, dictionary_columns, numeric_columns, write_store
 
 # keeping only relevant columns
 keep_cols = [
@@ -30,57 +22,426 @@ keep_cols = [
     "BASIC_ZONE", "ZONE_NAME", "ZONE_ABB", "ZONE_RANGE", "LOC_X", "LOC_Y",
     "QUARTER", "MINS_LEFT", "SECS_LEFT"
 ]
-df_cleaned = df[keep_cols].copy()
 
-# 7930 missing values - all in POSITION column
-df_cleaned = df_cleaned.dropna()
+# Explicit dtypes for reading raw season CSVs in streaming mode.
+# Coordinates stay float64 so the bins match the batch path exactly.
+raw_dtypes = {
+    "SEASON_1": "int16", "TEAM_ID": "int32", "PLAYER_ID": "int32",
+    "TEAM_NAME": "category", "PLAYER_NAME": "category",
+    "POSITION": "category", "POSITION_GROUP": "category",
+    "HOME_TEAM": "category", "AWAY_TEAM": "category", "SHOT_MADE": "bool",
+    "ACTION_TYPE": "category", "SHOT_TYPE": "category",
+    "BASIC_ZONE": "category", "ZONE_NAME": "category",
+    "ZONE_ABB": "category", "ZONE_RANGE": "category",
+    "LOC_X": "float64", "LOC_Y": "float64",
+    "QUARTER": "int16", "MINS_LEFT": "int16", "SECS_LEFT": "int16",
+}
 
-# Make QUARTER values greater than 4 into value "OT"
-df_cleaned["QUARTER"] = df_cleaned["QUARTER"].apply(lambda x: x if x <= 4 else "OT")
+# Period labels: quarters 1-4, every overtime period collapses to "OT"
+period_labels = ["1", "2", "3", "4", "OT"]
 
-# Unify minutes and seconds left into single column SECS_LEFT_UNIFIED
-df_cleaned['SECS_LEFT_UNIFIED'] = df_cleaned['MINS_LEFT'] * 60 + df_cleaned['SECS_LEFT']
+# Seasons left out of the cleaned dataset
+excluded_seasons = [2020, 2021, 2022]
 
-# Drop the old columns
-df_cleaned = df_cleaned.drop(columns=['MINS_LEFT', 'SECS_LEFT'])
+# Compact, typed columns for the columnar artifact
+categorical_cols = [
+    "TEAM_NAME", "PLAYER_NAME", "POSITION", "POSITION_GROUP",
+    "HOME_TEAM", "AWAY_TEAM", "ACTION_TYPE", "SHOT_TYPE",
+    "BASIC_ZONE", "ZONE_NAME", "ZONE_ABB", "ZONE_RANGE", "QUARTER",
+]
+column_dtypes = {
+    "SEASON_1": "int16",
+    "TEAM_ID": "int32",
+    "PLAYER_ID": "int32",
+    "SHOT_MADE": "bool",
+    "LOC_X": "float32",
+    "LOC_Y": "float32",
+    "SECS_LEFT_UNIFIED": "int16",
+    "x_bin": "int8",
+    "y_bin": "int8",
+    "zone_id": "int16",
+}
 
-# removed all rows with x or y values outside 0-50 range (mainly back court shots)
-df_cleaned = df_cleaned[
-    ~(
-        (df_cleaned["LOC_X"].abs() > 50) | 
-        (df_cleaned["LOC_Y"] > 50) | 
-        (df_cleaned["LOC_X"].abs() < 0) | 
-        (df_cleaned["LOC_Y"].abs() < 0)
-    )
+# Columns exported to the memory-mapped store
+store_columns = list(numeric_columns) + dictionary_columns
+
+# Cleaned per-season partitions, keyed by source file name, size, mtime
+# and the cleaning parameters
+cache_dir = ".clean_cache"
+
+# Parquet metadata entry holding the hash of the inputs and parameters
+ARTIFACT_KEY = b"clean_key"
+
+
+def compact_dtypes(df):
+    """Cast the cleaned columns to categoricals and small numeric types."""
+    for col in categorical_cols:
+        values = df[col].astype("category").cat.remove_unused_categories()
+        df[col] = values.cat.reorder_categories(sorted(values.cat.categories))
+    return df.astype(column_dtypes)
+
+
+def map_periods(quarter):
+    """Map raw QUARTER numbers to a categorical of period_labels (5+ -> "OT")."""
+    codes = np.minimum(quarter.to_numpy(), len(period_labels)) - 1
+    return pd.Categorical.from_codes(codes, categories=period_labels)
+
+
+def drop_missing(df):
+    """Keep the relevant columns and drop rows with missing values."""
+    # 7930 missing values - all in POSITION column
+    return df[keep_cols].dropna()
+
+
+def add_periods(df):
+    # Make QUARTER values greater than 4 into value "OT"
+    df["QUARTER"] = map_periods(df["QUARTER"])
+    return df
+
+
+def add_unified_time(df):
+    # Unify minutes and seconds left into single column SECS_LEFT_UNIFIED
+    df['SECS_LEFT_UNIFIED'] = df['MINS_LEFT'] * 60 + df['SECS_LEFT']
+
+    # Drop the old columns
+    return df.drop(columns=['MINS_LEFT', 'SECS_LEFT'])
+
+
+def filter_court(df):
+    """Drop shots outside the half court and the excluded seasons."""
+    # removed all rows with x or y values outside 0-50 range (mainly back court shots)
+    df = df[
+        ~(
+            (df["LOC_X"].abs() > 50) |
+            (df["LOC_Y"] > 50) |
+            (df["LOC_X"].abs() < 0) |
+            (df["LOC_Y"].abs() < 0)
+        )
+    ]
+    return df[~df["SEASON_1"].isin(excluded_seasons)].copy()
+
+
+def add_zones(df):
+    # Convert coordinates to fine bin indices
+    df["x_bin"] = zones.bin_index(df["LOC_X"], zones.x_min, zones.num_x_bins)
+    df["y_bin"] = zones.bin_index(df["LOC_Y"], zones.y_min, zones.num_y_bins)
+
+    # Unique zone id for each (x_bin, y_bin), 0 to zones.n_zones - 1
+    df["zone_id"] = zones.zone_id(df["x_bin"], df["y_bin"], zones.num_y_bins)
+    return df
+
+
+# The cleaning pass, in order (also timed stage by stage in benchmark.py)
+cleaning_steps = [
+    ("dropna", drop_missing),
+    ("periods", add_periods),
+    ("time", add_unified_time),
+    ("court_filter", filter_court),
+    ("binning", add_zones),
+    ("compact", compact_dtypes),
 ]
-df_cleaned = df_cleaned[~df_cleaned["SEASON_1"].isin([2020, 2021, 2022])]
 
-print("Cleaned dataset shape:", df_cleaned.shape)
-print(df_cleaned.head())
-print(df_cleaned.info())
 
-# Define 2×2 zones over the half court:
-# LOC_X is in  [-50, 50], LOC_Y is in  [0, 50]
-x_min, x_max = -50, 50
-y_min, y_max = 0, 50
-x_bin_width = 2
-y_bin_width = 2
+def clean_shots(df):
+    """Apply the full cleaning and zoning pass to a frame of raw shots."""
+    for name, step in cleaning_steps:
+        with tracing.span(f"clean.{name}"):
+            df = step(df)
+    return df
+
+
+def season_files(path):
+    """Season CSVs in the dataset folder, in a stable order."""
+    return sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".csv"))
+
+
+def cleaning_params():
+    """Everything besides the input files that changes the cleaned output."""
+    return {
+        "keep_cols": keep_cols,
+        "raw_dtypes": raw_dtypes,
+        "period_labels": period_labels,
+        "excluded_seasons": excluded_seasons,
+        "court": [zones.x_min, zones.x_max, zones.y_min, zones.y_max],
+        "bin_width": zones.fine_bin_width,
+        "categorical_cols": categorical_cols,
+        "column_dtypes": column_dtypes,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def params_hash():
+    """Hash of cleaning_params() and of the code that does the cleaning."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(cleaning_params(), sort_keys=True).encode())
+    for code_path in (__file__, zones.__file__):
+        with open(code_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def file_hash(file_path, known=None):
+    """
+    Content hash of one file. `known` maps paths to (size, mtime_ns, hash)
+    from earlier runs, so unchanged files are not read again.
+    """
+    stat = os.stat(file_path)
+    if known is not None:
+        size, mtime_ns, digest = known.get(file_path, (None, None, None))
+        if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return digest
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    digest = digest.hexdigest()
+    if known is not None:
+        known[file_path] = (stat.st_size, stat.st_mtime_ns, digest)
+    return digest
+
+
+def clean_key(path):
+    """
+    Hash of every season CSV in `path` plus params_hash(): the cleaned
+    artifact can be reused exactly when this is unchanged.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    known_path = os.path.join(cache_dir, "file_hashes.json")
+    known = {}
+    if os.path.exists(known_path):
+        with open(known_path) as f:
+            known = {k: tuple(v) for k, v in json.load(f).items()}
+
+    digest = hashlib.blake2b(params_hash().encode(), digest_size=16)
+    for file_path in season_files(path):
+        digest.update(os.path.basename(file_path).encode())
+        digest.update(file_hash(file_path, known).encode())
+
+    with open(known_path, "w") as f:
+        json.dump(known, f)
+    return digest.hexdigest()
+
+
+def artifact_key(output_path):
+    """clean_key() stored in a cleaned Parquet file, or None."""
+    if not os.path.exists(output_path):
+        return None
+    metadata = pq.read_schema(output_path).metadata or {}
+    key = metadata.get(ARTIFACT_KEY)
+    return key.decode() if key is not None else None
+
+
+def write_artifact(df, output_path, key=None):
+    """Write the cleaned frame as Parquet, recording clean_key() in its metadata."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if key is not None:
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), ARTIFACT_KEY: key.encode()}
+        )
+    pq.write_table(table, output_path)
+
+
+def partition_path(file_path):
+    """Cache location of the cleaned partition for one season CSV."""
+    stat = os.stat(file_path)
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    # Partitions cleaned with other parameters or code are not reused
+    return os.path.join(
+        cache_dir,
+        f"{stem}-{stat.st_size}-{stat.st_mtime_ns}-{params_hash()[:12]}.parquet",
+    )
+
+
+def clean_season_file(file_path):
+    """Clean one season CSV into its cached partition and return the partition path."""
+    out_path = partition_path(file_path)
+    print(f"Cleaning {os.path.basename(file_path)}...")
+    clean_shots(pd.read_csv(file_path)).to_parquet(out_path, index=False)
+
+    # Drop partitions left over from older versions of the same file
+    prefix = os.path.splitext(os.path.basename(file_path))[0] + "-"
+    for name in os.listdir(cache_dir):
+        old_path = os.path.join(cache_dir, name)
+        if name.startswith(prefix) and old_path != out_path:
+            os.remove(old_path)
+
+    return out_path
+
+
+def clean_all(path, workers=None):
+    """
+    Clean every season CSV in `path`, reusing cached partitions for files
+    whose name, size and mtime are unchanged, and merge the partitions.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    all_files = season_files(path)
+
+    partitions = {file_path: partition_path(file_path) for file_path in all_files}
+    stale = [f for f in all_files if not os.path.exists(partitions[f])]
+    print(f"{len(all_files) - len(stale)} cached season(s), {len(stale)} to clean")
+
+    if stale:
+        with tracing.span("clean.partitions"), ProcessPoolExecutor(max_workers=workers) as pool:
+            for file_path, out_path in zip(stale, pool.map(clean_season_file, stale)):
+                partitions[file_path] = out_path
+
+    # Merge the partitions in file order; categories differ per season, so re-compact
+    with tracing.span("clean.merge"):
+        df_cleaned = pd.concat(
+            [pd.read_parquet(partitions[f]) for f in all_files], ignore_index=True
+        )
+        return compact_dtypes(df_cleaned)
+
+
+def stream_clean(path, output_path, chunksize=500_000, csv_output_path=None, key=None):
+    """
+    Clean every season CSV chunk by chunk and append each cleaned chunk to
+    the Parquet output (and optional CSV export), so peak memory depends on
+    the chunk size rather than the dataset size.
+
+    Rows come out in the same order as clean_all(); categories are listed in
+    order of first appearance instead of sorted, see draw_basketball_court.load_shots.
+    """
+    writer = None
+    n_rows = 0
+    try:
+        for file_path in season_files(path):
+            print(f"Streaming {os.path.basename(file_path)}...")
+            chunks = pd.read_csv(
+                file_path, usecols=keep_cols, dtype=raw_dtypes, chunksize=chunksize
+            )
+            for chunk in chunks:
+                cleaned = clean_shots(chunk)
+                table = pa.Table.from_pandas(cleaned, preserve_index=False)
+
+                if writer is None:
+                    # Same dictionary index width for every chunk
+                    schema = pa.schema([
+                        pa.field(f.name, pa.dictionary(pa.int32(), pa.string()))
+                        if pa.types.is_dictionary(f.type) else pa.field(f.name, f.type)
+                        for f in table.schema
+                    ])
+                    if key is not None:
+                        schema = schema.with_metadata({ARTIFACT_KEY: key.encode()})
+                    writer = pq.ParquetWriter(output_path, schema)
+                writer.write_table(table.cast(schema))
+
+                if csv_output_path is not None:
+                    cleaned.to_csv(
+                        csv_output_path,
+                        mode="w" if n_rows == 0 else "a",
+                        header=n_rows == 0,
+                        index=False,
+                    )
+                n_rows += len(cleaned)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download and clean the NBA shots dataset.")
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="also export clean_shots_with_zones.csv next to the Parquet file",
+    )
+    parser.add_argument(
+        "--source",
+        default="kaggle",
+        help='where season CSVs come from: "kaggle" (default), "local:<folder>" '
+             'or "synthetic:<rows>[:<seed>]"',
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes used to clean season files (default: CPU count)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="clean in bounded-memory chunks and append to the output as they finish",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=500_000,
+        help="rows per chunk in --stream mode (default: 500000)",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help=f"also export a memory-mapped column store to {STORE_NAME}/ "
+             "(shared zero-copy by viewers and batch workers)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="record per-stage timing spans and save them to shot_trace.json "
+             "(same as setting SHOT_TRACE=1)",
+    )
+    args = parser.parse_args()
+    if args.trace:
+        tracing.enable()
+
+    # load in data
+    path = make_source(args.source).path()
+
+    print("Dataset folder:", path)
+    print("Files in folder:", os.listdir(path))
+
+    output_path = "clean_shots_with_zones.parquet"
+    csv_output_path = "clean_shots_with_zones.csv" if args.csv else None
+
+    # Recorded in the artifact so run_pipeline.py can tell whether it is stale
+    key = clean_key(path)
+
+    if args.stream:
+        with tracing.span("clean.stream"):
+            n_rows = stream_clean(path, output_path, args.chunksize, csv_output_path, key)
+        print(f"Saved {n_rows} rows to {output_path}")
+        if csv_output_path is not None:
+            print(f"Saved {csv_output_path}")
+        if args.store:
+            # Read back only the store's columns
+            with tracing.span("clean.write_store"):
+                write_store(
+                    pd.read_parquet(output_path, columns=store_columns), STORE_NAME, key
+                )
+            print(f"Saved {STORE_NAME}/")
+        if tracing.enabled():
+            tracing.dump()
+        return
+
+    with tracing.span("clean.all"):
+        df_cleaned = clean_all(path, workers=args.workers)
+
+    print("Cleaned + zoned dataset shape:", df_cleaned.shape)
+    print(df_cleaned[["LOC_X", "LOC_Y", "x_bin", "y_bin", "zone_id"]].head())
 
-# Convert coordinates to bin indices
-df_cleaned["x_bin"] = ((df_cleaned["LOC_X"] - x_min) // x_bin_width).astype(int)
-df_cleaned["y_bin"] = ((df_cleaned["LOC_Y"] - y_min) // y_bin_width).astype(int)
+    # Save final dataset with zones as Parquet in repo root
+    with tracing.span("clean.write"):
+        write_artifact(df_cleaned, output_path, key)
+    print(f"Saved {output_path}")
 
-# Number of bins in each direction
-num_x_bins = int((x_max - x_min) / x_bin_width)   
-num_y_bins = int((y_max - y_min) / y_bin_width)
+    # Optional CSV export
+    if csv_output_path is not None:
+        with tracing.span("clean.write_csv"):
+            df_cleaned.to_csv(csv_output_path, index=False)
+        print(f"Saved {csv_output_path}")
 
-# Unique zone id for each (x_bin, y_bin)
-df_cleaned["zone_id"] = (df_cleaned["x_bin"] * num_y_bins + df_cleaned["y_bin"] + 1).astype(int)
+    if args.store:
+        with tracing.span("clean.write_store"):
+            write_store(df_cleaned, STORE_NAME, key)
+        print(f"Saved {STORE_NAME}/")
 
+    if tracing.enabled():
+        tracing.dump()
 
-print("Cleaned + zoned dataset shape:", df_cleaned.shape)
-print(df_cleaned[["LOC_X", "LOC_Y", "x_bin", "y_bin", "zone_id"]].head())
 
-# Save final dataset with zones as CSV in repo root
-output_path = "clean_shots_with_zones.csv"
-df_cleaned.to_csv(output_path, index=False)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Kaggle dataset used by default
+KAGGLE_DATASET = "mexwell/nba-shots"
+
+TEAMS = [
+    ("ATL", "Atlanta Hawks"), ("BOS", "Boston Celtics"), ("BKN", "Brooklyn Nets"),
+    ("CHA", "Charlotte Hornets"), ("CHI", "Chicago Bulls"), ("CLE", "Cleveland Cavaliers"),
+    ("DAL", "Dallas Mavericks"), ("DEN", "Denver Nuggets"), ("DET", "Detroit Pistons"),
+    ("GSW", "Golden State Warriors"), ("HOU", "Houston Rockets"), ("IND", "Indiana Pacers"),
+    ("LAC", "LA Clippers"), ("LAL", "Los Angeles Lakers"), ("MEM", "Memphis Grizzlies"),
+    ("MIA", "Miami Heat"), ("MIL", "Milwaukee Bucks"), ("MIN", "Minnesota Timberwolves"),
+    ("NOP", "New Orleans Pelicans"), ("NYK", "New York Knicks"), ("OKC", "Oklahoma City Thunder"),
+    ("ORL", "Orlando Magic"), ("PHI", "Philadelphia 76ers"), ("PHX", "Phoenix Suns"),
+    ("POR", "Portland Trail Blazers"), ("SAC", "Sacramento Kings"), ("SAS", "San Antonio Spurs"),
+    ("TOR", "Toronto Raptors"), ("UTA", "Utah Jazz"), ("WAS", "Washington Wizards"),
+]
+
+# (POSITION_GROUP, POSITION) pairs and how often players have them
+POSITIONS = [("G", "PG"), ("G", "SG"), ("F", "SF"), ("F", "PF"), ("C", "C")]
+POSITION_WEIGHTS = [0.22, 0.22, 0.2, 0.2, 0.16]
+
+# Shot families: share of attempts, then distance from the hoop in feet
+SHOT_MIX = {
+    "rim": 0.32,
+    "paint": 0.12,
+    "mid": 0.18,
+    "three": 0.37,
+    "heave": 0.01,
+}
+
+# Hoop position in the dataset's court coordinates
+HOOP_X, HOOP_Y = 0.0, 5.0
+
+
+class LocalSource:
+    """Season CSVs already on disk, e.g. a copied Kaggle download on an air-gapped host."""
+
+    def __init__(self, path):
+        self.path_ = path
+
+    def path(self):
+        return self.path_
+
+
+class KaggleSource:
+    """The Kaggle download (needs network access the first time)."""
+
+    def __init__(self, dataset=KAGGLE_DATASET):
+        self.dataset = dataset
+
+    def path(self):
+        import kagglehub
+
+        return kagglehub.dataset_download(self.dataset)
+
+
+class SyntheticSource:
+    """
+    Seeded synthetic season CSVs with the Kaggle schema, generated once per
+    (n_rows, seed) into out_dir and reused afterwards.
+    """
+
+    def __init__(self, n_rows, seed=0, seasons=range(2004, 2025), out_dir=".synthetic"):
+        self.n_rows = n_rows
+        self.seed = seed
+        self.seasons = list(seasons)
+        self.out_dir = os.path.join(out_dir, f"{n_rows}-{seed}")
+
+    def path(self):
+        done_path = os.path.join(self.out_dir, ".done")
+        if not os.path.exists(done_path):
+            write_synthetic_csvs(self.out_dir, self.n_rows, self.seed, self.seasons)
+            open(done_path, "w").close()
+        return self.out_dir
+
+
+def make_source(spec):
+    """
+    Build a data source from a command-line spec:
+    "kaggle", "local:<folder>" or "synthetic:<rows>[:<seed>]".
+    """
+    kind, _, rest = spec.partition(":")
+    if kind == "kaggle":
+        return KaggleSource(rest or KAGGLE_DATASET)
+    if kind == "local":
+        return LocalSource(rest)
+    if kind == "synthetic":
+        rows, _, seed = rest.partition(":")
+        return SyntheticSource(int(float(rows)), seed=int(seed or 0))
+    raise ValueError(f"Unknown data source: {spec!r}")
+
+
+def _shot_locations(rng, n):
+    """Shot coordinates drawn from a mix of rim, paint, mid-range, three and heave attempts."""
+    family = rng.choice(len(SHOT_MIX), size=n, p=list(SHOT_MIX.values()))
+    dist = np.select(
+        [family == 0, family == 1, family == 2, family == 3],
+        [
+            np.abs(rng.normal(0, 2.5, n)),
+            rng.uniform(4, 14, n),
+            rng.uniform(14, 22, n),
+            23.75 + np.abs(rng.normal(0, 1.5, n)),
+        ],
+        default=rng.uniform(35, 75, n),
+    )
+    # Angle measured from the baseline; most shots come from in front of the hoop
+    angle = np.clip(rng.normal(np.pi / 2, 0.75, n), 0.0, np.pi)
+    x = HOOP_X + dist * np.cos(angle)
+    y = HOOP_Y + dist * np.sin(angle)
+
+    # Corner threes sit on the sideline strip instead of the arc
+    corner = (family == 3) & (rng.random(n) < 0.25)
+    x = np.where(corner, np.sign(x + 1e-9) * rng.uniform(22, 23.5, n), x)
+    y = np.where(corner, rng.uniform(0, 9, n), y)
+    return np.round(x, 1), np.round(np.maximum(y, 0.0), 2), family
+
+
+def _zone_labels(x, y, family):
+    """BASIC_ZONE, ZONE_NAME, ZONE_ABB, ZONE_RANGE and SHOT_TYPE for each shot."""
+    dist = np.hypot(x - HOOP_X, y - HOOP_Y)
+    three = (family >= 3) | (dist > 23.75)
+
+    basic = np.select(
+        [y > 47, dist <= 4, (np.abs(x) <= 8) & (y <= 19), ~three, np.abs(x) >= 22],
+        ["Backcourt", "Restricted Area", "In The Paint (Non-RA)", "Mid-Range",
+         np.where(x < 0, "Left Corner 3", "Right Corner 3")],
+        default="Above the Break 3",
+    )
+    side = np.select(
+        [y > 47, x < -15, x < -5, x <= 5, x <= 15],
+        ["Back Court", "Left Side", "Left Side Center", "Center", "Right Side Center"],
+        default="Right Side",
+    )
+    abb = pd.Series(side).map({
+        "Back Court": "BC", "Left Side": "L", "Left Side Center": "LC",
+        "Center": "C", "Right Side Center": "RC", "Right Side": "R",
+    }).to_numpy()
+    zone_range = np.select(
+        [y > 47, dist < 8, dist < 16, dist < 24],
+        ["Back Court Shot", "Less Than 8 ft.", "8-16 ft.", "16-24 ft."],
+        default="24+ ft.",
+    )
+    shot_type = np.where(three, "3PT Field Goal", "2PT Field Goal")
+    return basic, side, abb, zone_range, shot_type, dist
+
+
+def generate_shots(n_rows, season, rng):
+    """One synthetic chunk of raw shots for a season, with the Kaggle columns."""
+    team_idx = rng.integers(0, len(TEAMS), n_rows)
+    abbrevs = np.array([abbrev for abbrev, _ in TEAMS])
+    names = np.array([name for _, name in TEAMS])
+
+    # 15-man rosters; a few players take most of a team's shots
+    roster_slot = np.minimum(rng.zipf(1.6, n_rows) - 1, 14)
+    player_id = 200000 + season % 100 * 1000 + team_idx * 15 + roster_slot
+    # Each player keeps one position (a fixed hash of the id)
+    position_idx = np.searchsorted(
+        np.cumsum(POSITION_WEIGHTS), (player_id * 40503 % 1000) / 1000, side="right"
+    ).clip(0, len(POSITIONS) - 1)
+
+    x, y, family = _shot_locations(rng, n_rows)
+    basic, side, abb, zone_range, shot_type, dist = _zone_labels(x, y, family)
+
+    # Make probability falls off with distance
+    fg_prob = np.clip(0.65 - 0.011 * dist, 0.03, 0.7)
+    made = rng.random(n_rows) < fg_prob
+
+    action = np.select(
+        [dist <= 2.5, dist <= 6],
+        [np.where(rng.random(n_rows) < 0.4, "Dunk Shot", "Layup Shot"), "Driving Layup Shot"],
+        default="Jump Shot",
+    )
+
+    quarter = rng.choice([1, 2, 3, 4, 5, 6], size=n_rows, p=[0.245, 0.245, 0.245, 0.245, 0.017, 0.003])
+    period_mins = np.where(quarter > 4, 5, 12)
+    secs_left = rng.integers(0, period_mins * 60, n_rows)
+
+    opponent = (team_idx + rng.integers(1, len(TEAMS), n_rows)) % len(TEAMS)
+    home = rng.random(n_rows) < 0.5
+
+    position_group = np.array([g for g, _ in POSITIONS])[position_idx].astype(object)
+    position = np.array([p for _, p in POSITIONS])[position_idx].astype(object)
+    # The real data is missing POSITION for about 0.2% of shots
+    position[rng.random(n_rows) < 0.002] = np.nan
+
+    return pd.DataFrame({
+        "SEASON_1": season,
+        "SEASON_2": f"{season - 1}-{season % 100:02d}",
+        "TEAM_ID": 1610612737 + team_idx,
+        "TEAM_NAME": names[team_idx],
+        "PLAYER_ID": player_id,
+        "PLAYER_NAME": np.char.add("Player ", player_id.astype(str)),
+        "POSITION_GROUP": position_group,
+        "POSITION": position,
+        "GAME_DATE": f"01-15-{season}",
+        "GAME_ID": 20000000 + season % 100 * 10000 + rng.integers(1, 1231, n_rows),
+        "HOME_TEAM": np.where(home, abbrevs[team_idx], abbrevs[opponent]),
+        "AWAY_TEAM": np.where(home, abbrevs[opponent], abbrevs[team_idx]),
+        "EVENT_TYPE": np.where(made, "Made Shot", "Missed Shot"),
+        "SHOT_MADE": made,
+        "ACTION_TYPE": action,
+        "SHOT_TYPE": shot_type,
+        "BASIC_ZONE": basic,
+        "ZONE_NAME": side,
+        "ZONE_ABB": abb,
+        "ZONE_RANGE": zone_range,
+        "LOC_X": x,
+        "LOC_Y": y,
+        "SHOT_DISTANCE": np.round(dist).astype(int),
+        "QUARTER": quarter,
+        "MINS_LEFT": secs_left // 60,
+        "SECS_LEFT": secs_left % 60,
+    })
+
+
+def write_synthetic_csvs(out_dir, n_rows, seed=0, seasons=range(2004, 2025), chunk_rows=1_000_000):
+    """
+    Write n_rows synthetic shots split evenly over one CSV per season, in
+    chunks of chunk_rows so 100M-row datasets fit in memory.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    seasons = list(seasons)
+    rng = np.random.default_rng(seed)
+
+    per_season = np.full(len(seasons), n_rows // len(seasons))
+    per_season[: n_rows % len(seasons)] += 1
+
+    for season, season_rows in zip(seasons, per_season):
+        file_path = os.path.join(out_dir, f"NBA_{season}_Shots.csv")
+        print(f"Generating {os.path.basename(file_path)} ({season_rows:,} rows)...")
+        for start in range(0, max(season_rows, 1), chunk_rows):
+            n = int(min(chunk_rows, season_rows - start))
+            generate_shots(n, season, rng).to_csv(
+                file_path, mode="w" if start == 0 else "a", header=start == 0, index=False
+            )
@@ -1,10 +1,19 @@
+import math
 import os
+import time
+import weakref
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle, Rectangle, Arc
+from matplotlib.backend_bases import key_press_handler
 from matplotlib.widgets import Button, Slider, RangeSlider
 import numpy as np
-import mplcursors
+
+import tracing
+import zones
+from shot_cube import ShotCube
+from shot_store import STORE_NAME, ShotStore, open_store, write_store
+from view_cache import Prefetcher, ViewCache
 
 
 def draw_half_court(ax=None, line_color="black", lw=2):
@@ -71,114 +80,401 @@ def draw_half_court(ax=None, line_color="black", lw=2):
     return ax
 
 
+# Quantiles of zone shot counts shown in the bubble-size legend
+LEGEND_QUANTILES = [0.25, 0.5, 0.9]
+
+
+def bubble_sizes(counts, min_size=20, scale_factor=40, max_size=700):
+    """Bubble areas for per-zone shot counts (sqrt scaling)."""
+    sizes = min_size + np.sqrt(counts) * scale_factor
+    return np.clip(sizes, min_size, max_size)
+
+
+def legend_counts(counts):
+    """Reference shot counts for the bubble-size legend."""
+    if counts.size == 0:
+        return np.array([], dtype=int)
+    if counts.size == 1:
+        return np.array([int(counts[0])])
+
+    # Use quantiles instead of min/max so labels are more interpretable
+    q = np.quantile(counts, LEGEND_QUANTILES)
+    ref_counts = np.unique(q.round().astype(int))
+    ref_counts = ref_counts[ref_counts > 0]  # no zero-shot labels
+    if ref_counts.size == 0:
+        ref_counts = np.array([int(counts.max())])
+    return ref_counts
+
+
 class DropdownMenu:
-    def __init__(self, ax, options, callback):
+    """
+    Button that opens a scrollable list of options. The list is a fixed
+    pool of max_visible option slots (plus scroll arrows) built on first
+    open; scrolling and filtering only relabel and show/hide those slots.
+    While the list is open, the mouse wheel scrolls it and typing filters
+    it (Backspace edits, Enter picks the first match, Escape closes).
+    Only one list per figure is open at a time.
+    """
+
+    # The open menu of each figure; opening another one closes it first
+    _open_menus = weakref.WeakKeyDictionary()
+
+    def __init__(self, ax, options, callback, max_visible=8):
         self.ax = ax
-        self.options = options
+        self.options = list(options)
         self.callback = callback
         self.current_idx = 0
         self.visible = False
-        self.option_patches = []
-        self.option_texts = []
         self.scroll_offset = 0
-        self.max_visible = 8  # Show 8 teams at a time
-        
+        self.max_visible = max_visible  # Show 8 teams at a time
+
+        # Typed filter and the option indexes that match it
+        self.filter_text = ""
+        self.matches = list(range(len(self.options)))
+
+        # Whether Matplotlib's key shortcuts are detached while typing
+        self._typing = False
+
+        # (axes, Button) slots, created on first open
+        self.up_slot = None
+        self.option_slots = []
+        self.down_slot = None
+
         # Main button
-        self.button = Button(ax, options[0])
+        self.button = Button(ax, self.options[0])
         self.button.on_clicked(self.toggle_dropdown)
-        
+
+        canvas = ax.figure.canvas
+        canvas.mpl_connect("scroll_event", self._on_scroll)
+        canvas.mpl_connect("key_press_event", self._on_key)
+
     def toggle_dropdown(self, event):
         if self.visible:
             self.hide_options()
         else:
             self.show_options()
-    
+
+    def _make_slot(self, label, color, hovercolor, fontsize, on_click):
+        slot_ax = self.ax.figure.add_axes([0, 0, 1, 1])
+        slot_ax.set_zorder(1000)
+        slot_ax.set_visible(False)
+        btn = Button(slot_ax, label, color=color, hovercolor=hovercolor)
+        btn.label.set_fontsize(fontsize)
+        btn.on_clicked(on_click)
+        return slot_ax, btn
+
+    def _build_slots(self):
+        self.up_slot = self._make_slot(
+            '▲ Scroll Up', 'lightgray', 'gray', 8, lambda e: self.scroll_up()
+        )
+
+        # Closure to capture the slot number
+        def make_callback(slot):
+            return lambda event: self.select_option(self.matches[self.scroll_offset + slot])
+
+        self.option_slots = [
+            self._make_slot("", 'white', 'lightblue', 9, make_callback(slot))
+            for slot in range(self.max_visible)
+        ]
+        self.down_slot = self._make_slot(
+            '▼ Scroll Down', 'lightgray', 'gray', 8, lambda e: self.scroll_down()
+        )
+
     def show_options(self):
-        self.visible = True
-        fig = self.ax.figure
-        
-        # Calculate positions
-        x, y = self.ax.get_position().x0, self.ax.get_position().y0
-        w, h = self.ax.get_position().width, self.ax.get_position().height
-        
-        # Determine which options to show based on scroll
-        start_idx = self.scroll_offset
-        end_idx = min(start_idx + self.max_visible, len(self.options))
-        
-        # Add scroll up button if needed
-        if self.scroll_offset > 0:
-            up_ax = fig.add_axes([x, y + h, w, h*0.6])
-            up_ax.set_zorder(1000)
-            up_btn = Button(up_ax, '▲ Scroll Up', color='lightgray', hovercolor='gray')
-            up_btn.label.set_fontsize(8)
-            up_btn.on_clicked(lambda e: self.scroll_up())
-            self.option_patches.append(up_ax)
-            self.option_texts.append(up_btn)
-            y_start = y + h - h*0.6
+        with tracing.span("dropdown.show_options"):
+            if not self.option_slots:
+                self._build_slots()
+            other = self._open_menus.get(self.ax.figure)
+            if other is not None and other is not self:
+                other.hide_options()
+            self._open_menus[self.ax.figure] = self
+            self.visible = True
+            self._set_typing(True)
+            self._layout()
+
+    def _layout(self):
+        """Place, label and show the slots for the current scroll offset and filter."""
+        pos = self.ax.get_position()
+        x, w, h = pos.x0, pos.width, pos.height
+        top = pos.y0
+
+        start = self.scroll_offset
+        end = min(start + self.max_visible, len(self.matches))
+
+        def place(slot, shown, height, active=True):
+            nonlocal top
+            slot_ax, btn = slot
+            slot_ax.set_visible(shown)
+            btn.set_active(shown and active)
+            if shown:
+                slot_ax.set_position([x, top - height, w, height])
+                top -= height
+
+        place(self.up_slot, self.visible and start > 0, h * 0.6)
+        for i, slot in enumerate(self.option_slots):
+            if i < end - start:
+                slot[1].label.set_text(self.options[self.matches[start + i]])
+                place(slot, self.visible, h * 0.8)
+            elif i == 0 and not self.matches:
+                slot[1].label.set_text("(no matches)")
+                place(slot, self.visible, h * 0.8, active=False)
+            else:
+                place(slot, False, h * 0.8)
+        place(self.down_slot, self.visible and end < len(self.matches), h * 0.6)
+
+        if self.filter_text:
+            self.button.label.set_text(f"Filter: {self.filter_text}_")
         else:
-            y_start = y + h
-        
-        # Show options
-        for i, option_idx in enumerate(range(start_idx, end_idx)):
-            option_ax = fig.add_axes([x, y_start - (i+1)*h*0.8, w, h*0.8])
-            option_ax.set_zorder(1000)
-            
-            btn = Button(option_ax, self.options[option_idx], color='white', hovercolor='lightblue')
-            btn.label.set_fontsize(9)
-            
-            # Closure to capture the index
-            def make_callback(idx):
-                return lambda event: self.select_option(idx)
-            
-            btn.on_clicked(make_callback(option_idx))
-            
-            self.option_patches.append(option_ax)
-            self.option_texts.append(btn)
-        
-        # Add scroll down button if needed
-        if end_idx < len(self.options):
-            down_y = y_start - (end_idx - start_idx)*h*0.8
-            down_ax = fig.add_axes([x, down_y - h*0.6, w, h*0.6])
-            down_ax.set_zorder(1000)
-            down_btn = Button(down_ax, '▼ Scroll Down', color='lightgray', hovercolor='gray')
-            down_btn.label.set_fontsize(8)
-            down_btn.on_clicked(lambda e: self.scroll_down())
-            self.option_patches.append(down_ax)
-            self.option_texts.append(down_btn)
-        
-        fig.canvas.draw_idle()
-    
+            self.button.label.set_text(self.options[self.current_idx])
+
+        self.ax.figure.canvas.draw_idle()
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.matches) - self.max_visible))
+        if offset != self.scroll_offset:
+            self.scroll_offset = offset
+            self._layout()
+
     def scroll_up(self):
-        if self.scroll_offset > 0:
-            self.scroll_offset = max(0, self.scroll_offset - self.max_visible)
-            self.hide_options()
-            self.show_options()
-    
+        self._scroll_to(self.scroll_offset - self.max_visible)
+
     def scroll_down(self):
-        if self.scroll_offset + self.max_visible < len(self.options):
-            self.scroll_offset = min(len(self.options) - self.max_visible, 
-                                    self.scroll_offset + self.max_visible)
+        self._scroll_to(self.scroll_offset + self.max_visible)
+
+    def _over_menu(self, event):
+        slots = [self.up_slot, self.down_slot] + self.option_slots
+        return event.inaxes is self.ax or any(event.inaxes is slot_ax for slot_ax, _ in slots)
+
+    def _on_scroll(self, event):
+        """Mouse wheel over the open list scrolls one option per step."""
+        if self.visible and self._over_menu(event):
+            self._scroll_to(self.scroll_offset - int(event.step))
+
+    def _set_typing(self, on):
+        """
+        While the list is open, keys go to the filter instead of Matplotlib's
+        default shortcuts (e.g. "s" saves, "q" closes the window).
+        """
+        manager = self.ax.figure.canvas.manager
+        if manager is None:
+            return
+        if on and manager.key_press_handler_id is not None:
+            self.ax.figure.canvas.mpl_disconnect(manager.key_press_handler_id)
+            manager.key_press_handler_id = None
+            self._typing = True
+        elif not on and self._typing:
+            manager.key_press_handler_id = self.ax.figure.canvas.mpl_connect(
+                "key_press_event", key_press_handler
+            )
+            self._typing = False
+
+    def _on_key(self, event):
+        if not self.visible:
+            return
+        if event.key == "escape":
             self.hide_options()
-            self.show_options()
-    
+            return
+        if event.key == "enter":
+            if self.matches:
+                self.select_option(self.matches[0])
+            return
+        if event.key == "backspace":
+            self.filter_text = self.filter_text[:-1]
+        elif event.key is not None and len(event.key) == 1 and event.key.isprintable():
+            self.filter_text += event.key
+        else:
+            return
+        self._apply_filter()
+
+    def _apply_filter(self):
+        needle = self.filter_text.lower()
+        self.matches = [
+            i for i, option in enumerate(self.options) if needle in str(option).lower()
+        ]
+        self.scroll_offset = 0
+        self._layout()
+
     def hide_options(self):
+        if self._open_menus.get(self.ax.figure) is self:
+            del self._open_menus[self.ax.figure]
         self.visible = False
-        for patch in self.option_patches:
-            patch.remove()
-        self.option_patches.clear()
-        self.option_texts.clear()
-        self.ax.figure.canvas.draw_idle()
-    
+        self._set_typing(False)
+        if self.filter_text:
+            self.filter_text = ""
+            self.matches = list(range(len(self.options)))
+            self.scroll_offset = 0
+        if self.option_slots:
+            self._layout()
+
     def select_option(self, idx):
         self.current_idx = idx
-        self.button.label.set_text(self.options[idx])
         self.hide_options()
+        self.button.label.set_text(self.options[idx])
         self.callback(self.options[idx])
 
+    def set_current(self, idx):
+        """Show option idx on the button without calling the callback."""
+        self.current_idx = idx
+        self.button.label.set_text(self.options[idx])
+
+
+# Players listed per tooltip section, and shots needed to rank by FG%
+TOOLTIP_PLAYERS = 3
+MIN_PLAYER_SHOTS = 5
+
+# Render modes: per-zone bubbles, or Gaussian-smoothed surfaces over the
+# fine grid (bandwidth in feet follows the zone size, see surface_bandwidth)
+RENDER_MODES = ["Bubbles", "Surface"]
+AREA_BANDWIDTH = 3
+SURFACE_ALPHA = 0.85
+
+# Bubble color modes: (colormap, color range, colorbar label)
+COLOR_MODES = {
+    "FG%": ("viridis", (0, 1), "Field Goal Percentage (FG%)"),
+    "vs League": ("RdBu_r", (-0.2, 0.2), "FG% vs League (difference)"),
+}
+
+
+def query_view(cube, key):
+    """ZoneView for one filter tuple (see compute_view)."""
+    team, season, quarter, time_window, position, level, player = key
+    if player is not None:
+        return cube.player_query(
+            player, season, quarter=quarter, time_window=time_window, level=level
+        )
+    return cube.query(
+        team,
+        season,
+        quarter=quarter,
+        time_window=time_window,
+        position=position,
+        level=level,
+    )
+
+
+def compute_view(cube, key):
+    """
+    Zone table for one filter tuple (team, season, quarter, time window,
+    position, zone level, player). A player key charts that player's shots
+    (team and position are None). The top-player index and tooltip texts
+    are filled in lazily on hover and then kept with the cached view.
+    """
+    # Slice the precomputed aggregate cube instead of masking the full frame
+    with tracing.span("view.filter"):
+        view = query_view(cube, key)
+
+    with tracing.span("view.groupby"):
+        # Aggregate by shot zones of the chosen level
+        grouped = view.zone_table()
+
+    with tracing.span("view.baseline"):
+        # League FG% in the same zones, season, quarter and time window,
+        # read from the cube's precomputed baseline tables
+        team, season, quarter, time_window, position, level, player = key
+        league_attempts, league_makes = cube.league_baseline(
+            season, quarter=quarter, time_window=time_window, level=level
+        )
+        zone = grouped["zone"].to_numpy()
+        grouped["league_fg"] = league_makes[zone] / league_attempts[zone]
+
+    # Player-level data is only built once a zone is hovered (view_players),
+    # surfaces once they are shown (view_surface)
+    return {"grouped": grouped, "players": None, "tooltips": {}, "surfaces": {}}
+
+
+def surface_bandwidth(zone_level):
+    """Smoothing bandwidth (feet) used for a ZoneLevel: its zone width."""
+    if zone_level.width is None:
+        return AREA_BANDWIDTH
+    return zone_level.width
+
+
+def view_surface(cube, key, bandwidth):
+    """
+    Smoothed attempt density plus FG% and league FG% surfaces for one
+    filter tuple (see compute_view), as (num_y_bins, num_x_bins) images.
+    The smoothing runs on the binned totals, so its cost does not depend
+    on how many shots the selection holds.
+    """
+    team, season, quarter, time_window, position, level, player = key
+    with tracing.span("view.surface"):
+        attempts, makes = query_view(cube, key).fine_totals()
+        league_attempts, league_makes = cube.league_baseline(
+            season, quarter=quarter, time_window=time_window, level=zones.FINE_LEVEL
+        )
+        density, made = (zones.smooth_zones(v, bandwidth) for v in (attempts, makes))
+        league_density, league_made = (
+            zones.smooth_zones(v, bandwidth) for v in (league_attempts, league_makes)
+        )
+    return {
+        "density": density,
+        "fg": np.divide(made, density, out=np.zeros_like(made), where=density > 1e-9),
+        "league_fg": np.divide(
+            league_made, league_density, out=np.zeros_like(league_made),
+            where=league_density > 1e-9,
+        ),
+    }
+
+
+def view_players(cube, key):
+    """Top-player index for one filter tuple (see compute_view)."""
+    team, season, quarter, time_window, position, level, player = key
+    with tracing.span("view.top_players"):
+        # Whole team/season/quarter slices share one index kept by the cube;
+        # time and position filters need an index over their own cells
+        if time_window is None and position is None and player is None:
+            return cube.player_index(team, season, quarter, level)
+        return query_view(cube, key).player_index()
+
+
+class UpdateScheduler:
+    """
+    Coalesces bursts of widget events (e.g. a slider drag) into a single
+    render on a canvas timer. The render callback reads the latest filter
+    state, so events that arrive while a render is pending are skipped.
+    """
+
+    def __init__(self, canvas, render, interval=40):
+        self.render = render
+        self.pending = False
+
+        # Counters for checking the effect of coalescing
+        self.requested = 0
+        self.performed = 0
+        self.skipped = 0
+
+        self.timer = canvas.new_timer(interval=interval)
+        self.timer.single_shot = True
+        self.timer.add_callback(self.flush)
+
+    def request(self):
+        """Ask for a render; starts the timer unless one is already pending."""
+        self.requested += 1
+        if self.pending:
+            self.skipped += 1
+            return
+        self.pending = True
+        self.timer.start()
+
+    def flush(self):
+        """Run the pending render now (also called by the timer)."""
+        if not self.pending:
+            return
+        self.timer.stop()
+        self.pending = False
+        self.performed += 1
+        self.render()
+
+    def stats(self):
+        return {
+            "requested": self.requested,
+            "performed": self.performed,
+            "skipped": self.skipped,
+        }
+
 
 class TeamSelector:
-    def __init__(self, df, fig, ax):
-        self.df = df
+    def __init__(self, df, fig, ax, cache_mb=64, prefetch=True):
         self.fig = fig
         self.ax = ax
         
@@ -187,54 +483,78 @@ class TeamSelector:
         self.ot_secs = 5 * 60           # 5:00
         self._current_time_max = self.regulation_secs
 
-        # Get unique teams
-        self.teams = sorted(df["TEAM_NAME"].unique().tolist())
+        # Attempts/makes per team, season, quarter, position, time and zone
+        # (a ShotStore comes with its cube already built and memory-mapped)
+        with tracing.span("init.cube"):
+            if isinstance(df, ShotStore):
+                self.cube = df.cube()
+            else:
+                self.cube = ShotCube(df)
+
+        # Dropdown and slider options come from the cube's dimension labels
+        # instead of scanning the frame again
+        self.teams = self.cube.teams.tolist()
+        self.quarters = ["All Quarters"] + self.cube.quarters.tolist()
+        self.positions = (
+            ["All Positions"]
+            + np.unique(self.cube.position_groups).tolist()
+            + np.unique(self.cube.positions).tolist()
+        )
+        # Player labels are unique per PLAYER_ID; the view key holds the ID
+        player_ids = dict(zip(self.cube.players.tolist(), self.cube.player_ids.tolist()))
+        self.players = ["All Players"] + sorted(player_ids)
+        self._player_ids = player_ids
+        self.min_year = int(self.cube.seasons.min())
+        self.max_year = int(self.cube.seasons.max())
+        self.current_year = self.min_year
 
-        # Get unique quarters and add "All Quarters" option
-        unique_quarters = sorted(df["QUARTER"].dropna().unique().tolist())
-        self.quarters = ["All Quarters"] + [str(q) for q in unique_quarters]
+        # Zone sizes, all summed from the fine bins in the cube
+        self.zone_levels = list(self.cube.levels)
 
-        # Get all positions and position groups
-        unique_positions = sorted(df["POSITION_GROUP"].unique().tolist()) + \
-                           sorted(df["POSITION"].unique().tolist())
-        self.positions = ["All Positions"] + [str(q) for q in unique_positions]
-        
-        # Get available seasons
-        years = sorted(df["SEASON_1"].dropna().unique().tolist())
-        self.min_year = int(min(years))
-        self.max_year = int(max(years))
-        self.current_year = self.min_year
-        
-        # Precompute total number of shots per (team, season)
-        total_shots_per_team_year = (
-            df.groupby(["TEAM_NAME", "SEASON_1"])
-            .size()
-            .reset_index(name="total_shots")
-        )
-        self.total_shots_by_team_year = {
-            (row["TEAM_NAME"], int(row["SEASON_1"])): int(row["total_shots"])
-            for _, row in total_shots_per_team_year.iterrows()
-        }
+        # Recently viewed filter combinations
+        self.view_cache = ViewCache(max_bytes=cache_mb * 2**20)
 
+        # Warms the cache with adjacent seasons/teams after each render
+        self.prefetcher = None
+        if prefetch:
+            self.prefetcher = Prefetcher(
+                self.view_cache, lambda key: compute_view(self.cube, key)
+            )
+            fig.canvas.mpl_connect("close_event", lambda event: self.prefetcher.close())
+        
         # Current selections
         self.current_team = self.teams[0]
         self.current_quarter = "All Quarters"
         self.current_position = "All Positions"
-        self.scatter = None
-        self.cbar = None
-        self.cbar_ax = None
-        self.size_legend = None 
+        self.current_level = zones.DEFAULT_LEVEL
+        self.current_player = "All Players"
+        self.color_mode = "FG%"
+        self.render_mode = "Bubbles"
         
         # Time slider instance (created later)
         self.time_slider = None
 
-        # Will store position after first colorbar creation
-        self.stable_position = None
+        # Data behind the current bubbles, read by the hover tooltip
+        self._view = None
+        self._view_key = None
+        self._zones = None
+        self._counts = None
+        self._fg = None
+        self._league_fg = None
+
+        # Cached static background for blitting (set on each full draw)
+        self._canvas = fig.canvas
+        self._background = None
+        self._background_bounds = None
 
-        # Create dropdowns, sliders, and initial plot
+        # Slider drags render through the scheduler, at most once per timer tick
+        self.scheduler = UpdateScheduler(fig.canvas, self.update_plot)
+
+        # Create dropdowns, sliders, court artists, and initial plot
         self.create_dropdowns()
         self.create_year_slider()
         self.create_time_slider()
+        self.create_artists()
         self.update_plot()
     
     def _format_secs_mmss(self, seconds: float) -> str:
@@ -254,27 +574,46 @@ class TeamSelector:
         self.time_slider.valtext.set_text(f"{hi_str} – {lo_str}")
 
     def create_dropdowns(self):
-        """Create team, quarter, and position dropdown menus."""
-        ax_team = plt.axes([0.05, 0.92, 0.25, 0.04])
+        """Create team, player, quarter, position and zone size dropdown menus."""
+        ax_team = plt.axes([0.05, 0.92, 0.16, 0.04])
         self.team_dropdown = DropdownMenu(
             ax_team,
             self.teams,
             lambda team_name: self.update_plot(team_name=team_name),
         )
 
-        ax_quarter = plt.axes([0.35, 0.92, 0.25, 0.04])
+        # Thousands of names: type while the list is open to search them
+        ax_player = plt.axes([0.23, 0.92, 0.16, 0.04])
+        self.player_dropdown = DropdownMenu(
+            ax_player,
+            self.players,
+            lambda player: self.update_plot(player=player),
+        )
+
+        ax_quarter = plt.axes([0.41, 0.92, 0.16, 0.04])
         self.quarter_dropdown = DropdownMenu(
             ax_quarter,
             self.quarters,
             lambda quarter: self.update_plot(quarter=quarter),
         )
 
-        ax_pos = plt.axes([0.65, 0.92, 0.25, 0.04])
+        ax_pos = plt.axes([0.59, 0.92, 0.16, 0.04])
         self.pos_dropdown = DropdownMenu(
             ax_pos,
             self.positions,
             lambda position: self.update_plot(position=position),
         )
+
+        # Default level first, so the button starts on the shown zone size
+        levels = [self.current_level] + [
+            level for level in self.zone_levels if level != self.current_level
+        ]
+        ax_zones = plt.axes([0.77, 0.92, 0.16, 0.04])
+        self.zone_dropdown = DropdownMenu(
+            ax_zones,
+            levels,
+            lambda level: self.update_plot(zone_level=level),
+        )
     
     def create_year_slider(self):
         """Create a slider to select the season (year)."""
@@ -287,19 +626,24 @@ class TeamSelector:
             valinit=self.current_year,
             valstep=1,
         )
+        # Redrawn by TeamSelector._redraw instead of a full canvas draw
+        self.year_slider.drawon = False
+        self.year_slider.ax.set_animated(True)
         self.year_slider.on_changed(self.on_year_change)
 
     def on_year_change(self, val):
         self.current_year = int(round(val))
-        self.update_plot()
+        self.scheduler.request()
         
     # Time Range RangeSlider
     def create_time_slider(self):
-        """Create the time-range slider axes once."""
+        """
+        Create the time-range slider axes once. The slider itself is only
+        built when a single quarter is first selected.
+        """
         self.time_ax = plt.axes([0.1, 0.05, 0.8, 0.10])
+        self.time_ax.set_visible(False)
         self.time_slider = None
-        self._rebuild_time_slider(self.regulation_secs)
-        self.time_slider.ax.set_visible(False)
 
     def _rebuild_time_slider(self, max_seconds: float):
         """(Re)build the RangeSlider for a given quarter length."""
@@ -314,17 +658,20 @@ class TeamSelector:
         )
         
         self.time_slider.ax.invert_xaxis()
+        self.time_slider.drawon = False
+        self.time_slider.ax.set_animated(True)
         self._update_time_slider_label(self.time_slider.val)
 
         def _on_time_change(val):
             self._update_time_slider_label(val)
-            self.update_plot()
+            self.scheduler.request()
 
         self.time_slider.on_changed(_on_time_change)
     
     def _update_time_slider_for_quarter(self):
         """Ensure the time slider matches the current quarter selection."""
-        if self.time_slider is None:
+        show_time = self.current_quarter != "All Quarters"
+        if self.time_slider is None and not show_time:
             return
 
         if self.current_quarter == "OT":
@@ -332,21 +679,349 @@ class TeamSelector:
         else:
             target_max = self.regulation_secs
 
-        if target_max != self._current_time_max:
+        if self.time_slider is None or target_max != self._current_time_max:
             self._rebuild_time_slider(target_max)
 
-        show_time = self.current_quarter != "All Quarters"
         self.time_slider.ax.set_visible(show_time)
 
     
-    def update_plot(self, team_name=None, quarter=None, position=None):
+    def create_artists(self):
+        """
+        Draw the static court once and create the artists that update_plot
+        mutates: the bubble scatter, its colorbar and the size legend. The
+        hover cursor is only created once the mouse first moves over the chart.
+        """
+        draw_half_court(self.ax)
+
+        # Court lines, redrawn over the surface when it is shown
+        self.court_artists = list(self.ax.patches) + list(self.ax.lines)
+
+        # Smoothed surface under the court lines, hidden in bubble mode. One
+        # cell per fine bin; a mesh blits several times faster than imshow,
+        # which resamples the image to screen pixels on every draw
+        cmap, (vmin, vmax), _ = COLOR_MODES[self.color_mode]
+        self.surface = self.ax.pcolormesh(
+            np.linspace(zones.x_min, zones.x_max, zones.num_x_bins + 1),
+            np.linspace(zones.y_min, zones.y_max, zones.num_y_bins + 1),
+            np.zeros((zones.num_y_bins, zones.num_x_bins)),
+            cmap=cmap,
+            vmin=vmin,
+            vmax=vmax,
+            shading="flat",
+            antialiased=False,
+            zorder=0,
+            animated=True,
+        )
+        # Face colors are set directly by _update_surface
+        self.surface.set_array(None)
+        self.surface.set_visible(False)
+
+        # Bubbles are animated so full draws leave them out of the cached background
+        self.scatter = self.ax.scatter(
+            np.empty(0),
+            np.empty(0),
+            s=np.empty(0),
+            c=np.empty(0),
+            cmap="viridis",
+            alpha=0.7,
+            zorder=10,
+            vmin=0,
+            vmax=1,
+            animated=True,
+        )
+
+        self.cbar = plt.colorbar(self.scatter, ax=self.ax)
+        self.cbar.set_label(COLOR_MODES[self.color_mode][2])
+
+        # Switches bubble color between raw FG% and FG% minus the league's
+        ax_color = self.fig.add_axes([0.91, 0.06, 0.08, 0.04])
+        self.color_button = Button(ax_color, "vs League")
+        self.color_button.label.set_fontsize(8)
+        self.color_button.on_clicked(self.toggle_color_mode)
+
+        # Switches between bubbles and smoothed surfaces
+        ax_render = self.fig.add_axes([0.91, 0.11, 0.08, 0.04])
+        self.render_button = Button(ax_render, RENDER_MODES[1])
+        self.render_button.label.set_fontsize(8)
+        self.render_button.on_clicked(self.toggle_render_mode)
+
+        # --- Bubble-size legend (shots per zone), one entry per reference count ---
+        handles = [
+            self.ax.scatter([], [], s=20, color="gray", alpha=0.7, edgecolor="gray")
+            for _ in range(len(LEGEND_QUANTILES))
+        ]
+        self.size_legend = self.ax.legend(
+            handles,
+            [""] * len(handles),
+            title="Shots in Zone",
+            loc="upper right",
+            bbox_to_anchor=(1.32, 1.00),
+            frameon=True,
+        )
+        self.size_legend.set_animated(True)
+
+        # Tooltip with per-zone details, set up after the first chart is shown
+        self.cursor = None
+        self._cursor_cid = self._canvas.mpl_connect("motion_notify_event", self._create_cursor)
+
+        # Phase timings overlay, only when tracing is on
+        self.trace_text = None
+        self._last_draw_time = None
+        if tracing.enabled():
+            self.trace_text = self.fig.text(
+                0.855, 0.6, "", va="top", ha="left", fontsize=6.5,
+                family="monospace", animated=True,
+                bbox=dict(fc="white", alpha=0.8, ec="none"),
+            )
+
+        self._canvas.mpl_connect("draw_event", self._on_draw)
+
+    def toggle_color_mode(self, event=None):
+        """Switch between FG% and vs-league colors; the colorbar needs a full draw."""
+        modes = list(COLOR_MODES)
+        self.color_button.label.set_text(self.color_mode)
+        self.color_mode = modes[(modes.index(self.color_mode) + 1) % len(modes)]
+
+        cmap, (vmin, vmax), label = COLOR_MODES[self.color_mode]
+        for artist in (self.scatter, self.surface):
+            artist.set_cmap(cmap)
+            artist.set_clim(vmin, vmax)
+        self.cbar.set_label(label)
+        self._background = None
+        self.update_plot()
+
+    def toggle_render_mode(self, event=None):
+        """Switch between per-zone bubbles and smoothed surfaces."""
+        self.render_button.label.set_text(self.render_mode)
+        self.render_mode = RENDER_MODES[(RENDER_MODES.index(self.render_mode) + 1) % len(RENDER_MODES)]
+        self._background = None
+        self.update_plot()
+
+    def _update_surface(self):
+        """Show the current view's smoothed surface, colored like the bubbles."""
+        bandwidth = surface_bandwidth(self.cube.levels[self.current_level])
+        surface = self._view["surfaces"].get(bandwidth)
+        if surface is None:
+            surface = view_surface(self.cube, self._view_key, bandwidth)
+            self._view["surfaces"][bandwidth] = surface
+            self.view_cache.resize(self._view_key)
+
+        values = surface["fg"]
+        if self.color_mode == "vs League":
+            values = values - surface["league_fg"]
+
+        # Opacity follows shot density, so empty court stays clear
+        density = surface["density"]
+        peak = density.max()
+        alpha = SURFACE_ALPHA * np.sqrt(density / peak) if peak > 0 else np.zeros_like(density)
+
+        # Colors are mapped here so the density can go in the alpha channel
+        rgba = self.surface.to_rgba(values)
+        rgba[..., 3] = alpha
+        self.surface.set_facecolor(rgba.reshape(-1, 4))
+
+    def _bubble_colors(self):
+        """Color values of the current bubbles for the active color mode."""
+        if self.color_mode == "vs League":
+            return self._fg - self._league_fg
+        return self._fg
+
+    def _create_cursor(self, event):
+        """Import mplcursors and attach the hover tooltip on the first mouse move over the chart."""
+        if event.inaxes is not self.ax:
+            return
+        self._canvas.mpl_disconnect(self._cursor_cid)
+        import mplcursors
+
+        # mplcursors toggles on plain "e"/"v" by default, which would fire
+        # while typing a name into an open dropdown; use Ctrl instead
+        self.cursor = mplcursors.cursor(
+            self.scatter, hover=True,
+            bindings={"toggle_enabled": "ctrl+e", "toggle_visible": "ctrl+v"},
+        )
+        self.cursor.connect("add", self._on_hover)
+
+    def _dynamic_artists(self):
+        """Artists redrawn on every update, on top of the cached background."""
+        artists = [self.year_slider.ax]
+        if self.time_slider is not None:
+            artists.append(self.time_slider.ax)
+        if self.surface.get_visible():
+            artists += [self.surface] + self.court_artists
+        artists += [self.scatter, self.size_legend]
+        if self.trace_text is not None:
+            artists.append(self.trace_text)
+        return artists
+
+    def _update_trace_overlay(self, spans):
+        """Show this update's phase timings, plus the previous update's draw."""
+        lines = [f"{name:<22}{seconds * 1000:8.2f} ms" for name, seconds in spans]
+        if self._last_draw_time is not None:
+            lines.append(f"{'update.draw (prev)':<22}{self._last_draw_time * 1000:8.2f} ms")
+        self.trace_text.set_text("\n".join(lines))
+
+    def _on_draw(self, event):
+        """After a full draw: cache the static background, then draw the dynamic artists."""
+        if event.canvas is self._canvas and self._canvas.supports_blit:
+            self._background = self._canvas.copy_from_bbox(self.fig.bbox)
+            self._background_bounds = self.fig.bbox.bounds
+
+        for artist in self._dynamic_artists():
+            artist.draw(event.renderer)
+
+    def _redraw(self):
+        """Blit the dynamic artists over the cached court, or fall back to a full draw."""
+        menus_open = any(
+            dropdown.visible
+            for dropdown in (
+                self.team_dropdown, self.player_dropdown, self.quarter_dropdown,
+                self.pos_dropdown, self.zone_dropdown,
+            )
+        )
+        if (
+            self._background is None
+            or self._background_bounds != self.fig.bbox.bounds
+            or menus_open
+        ):
+            self._canvas.draw_idle()
+            return
+
+        self._canvas.restore_region(self._background)
+        for artist in self._dynamic_artists():
+            self.fig.draw_artist(artist)
+        self._canvas.blit(self.fig.bbox)
+
+    def _on_hover(self, sel):
+        """Fill in the tooltip for the hovered zone."""
+        zone = self._zones[sel.index]
+        text = self._view["tooltips"].get(zone)
+        if text is None:
+            text = self._tooltip_text(sel.index)
+            self._view["tooltips"][zone] = text
+            # Count the new text (and a just-built player index) in the cache size
+            self.view_cache.resize(self._view_key)
+
+        sel.annotation.set_text(text)
+        sel.annotation.get_bbox_patch().set(fc="white", alpha=0.9)
+
+    def _tooltip_text(self, i):
+        """Tooltip for the i-th bubble; builds the view's player index on first use."""
+        text = (
+            f"Shots: {self._counts[i]}\nFG%: {self._fg[i]:.2f}\n"
+            f"League FG%: {self._league_fg[i]:.2f} ({self._fg[i] - self._league_fg[i]:+.2f})\n"
+        )
+        zone = self._zones[i]
+        if self.cube.levels[self._view_key[5]].source == "area":
+            text = f"{self.cube.area_basic[zone]} ({self.cube.area_names[zone]})\n" + text
+
+        # A player chart has no other players to rank
+        if self._view_key[6] is not None:
+            return text.rstrip("\n")
+
+        if self._view["players"] is None:
+            self._view["players"] = view_players(self.cube, self._view_key)
+        players = self._view["players"]
+
+        by_volume = players.top_by_volume(zone, k=TOOLTIP_PLAYERS)
+        by_fg = players.top_by_fg(zone, k=TOOLTIP_PLAYERS, min_shots=MIN_PLAYER_SHOTS)
+
+        if by_volume:
+            text += "\nTop Players (Volume):\n"
+            for player, shots, _ in by_volume:
+                text += f"  {self.cube.players[player]}: {shots} shots\n"
+        if by_fg:
+            text += f"\nTop Players (Accuracy, {MIN_PLAYER_SHOTS}+ shots):\n"
+            for player, shots, makes in by_fg:
+                text += f"  {self.cube.players[player]}: {makes / shots:.2f} FG%\n"
+        if not by_volume:
+            text += "\nNo qualifying players.\n"
+        return text.rstrip("\n")
+
+    def view_key(self):
+        """
+        Full filter tuple (team, season, quarter, time window, position,
+        zone level, PLAYER_ID) of the current selection; None stands for "all". Shot times are whole
+        seconds, so the time window is narrowed to integers. With a player
+        picked, team and position do not apply and are None.
+        """
+        quarter = None
+        time_window = None
+        if self.current_quarter != "All Quarters":
+            quarter = self.current_quarter
+            if self.time_slider is not None:
+                t_min, t_max = sorted(self.time_slider.val)
+                time_window = (math.ceil(t_min), math.floor(t_max))
+
+        if self.current_player != "All Players":
+            return (
+                None, self.current_year, quarter, time_window, None, self.current_level,
+                self._player_ids[self.current_player],
+            )
+
+        position = None
+        if self.current_position != "All Positions":
+            position = self.current_position
+
+        return (
+            self.current_team, self.current_year, quarter, time_window, position, self.current_level,
+            None,
+        )
+
+    def neighbor_keys(self, key):
+        """Views one step away on the season slider or in the team list."""
+        team, season, quarter, time_window, position, level, player = key
+        keys = [
+            (team, season + step, quarter, time_window, position, level, player)
+            for step in (1, -1)
+            if self.min_year <= season + step <= self.max_year
+        ]
+        if team is None:
+            return keys
+
+        team_idx = self.teams.index(team)
+        keys += [
+            (self.teams[team_idx + step], season, quarter, time_window, position, level, player)
+            for step in (1, -1)
+            if 0 <= team_idx + step < len(self.teams)
+        ]
+        return keys
+
+    def _select_player(self, player):
+        """
+        Switch to one player's chart (or back to team charts). If the player
+        has no shots in the current season, jump to their latest season.
+        """
+        self.current_player = player
+        if player == "All Players":
+            return
+        # The position filter does not apply to a player chart
+        self.current_position = "All Positions"
+        self.pos_dropdown.set_current(0)
+        seasons = self.cube.player_seasons(self._player_ids[player])
+        if seasons and self.current_year not in seasons:
+            self.current_year = seasons[-1]
+            # Move the slider without queuing a second render
+            self.year_slider.eventson = False
+            self.year_slider.set_val(self.current_year)
+            self.year_slider.eventson = True
+
+    def update_plot(self, team_name=None, quarter=None, position=None, zone_level=None,
+                    player=None):
         """Update the shot chart based on current filters."""
+        if player is not None:
+            self._select_player(player)
         if team_name is not None:
             self.current_team = team_name
         if quarter is not None:
             self.current_quarter = quarter
         if position is not None:
             self.current_position = position
+        # Picking a team or a position leaves the player chart
+        if (team_name is not None or position is not None) and self.current_player != "All Players":
+            self.current_player = "All Players"
+            self.player_dropdown.set_current(0)
+        if zone_level is not None:
+            self.current_level = zone_level
         
         if hasattr(self, "time_slider"):
             self._update_time_slider_for_quarter()
@@ -354,238 +1029,178 @@ class TeamSelector:
         if self.time_slider is not None:
             show_time = self.current_quarter != "All Quarters"
             self.time_slider.ax.set_visible(show_time)
-        
-        # Clear the main axis
-        self.ax.clear()
 
-        if self.stable_position is not None:
-            self.ax.set_position(self.stable_position)
-
-        draw_half_court(self.ax)
+        trace_start = tracing.mark()
+
+        # Reuse the computed view when this filter combination was seen before
+        key = self.view_key()
+        with tracing.span("update.cache_lookup"):
+            view = self.view_cache.get(key)
+        if view is None:
+            view = compute_view(self.cube, key)
+            self.view_cache.put(key, view)
+
+        grouped = view["grouped"]
+        self._view = view
+        self._view_key = key
+        # Plain arrays so a hover is an index lookup, not a pandas .iloc
+        self._zones = grouped["zone"].to_numpy()
+        self._counts = grouped["count"].to_numpy()
+        self._fg = grouped["fg"].to_numpy()
+        self._league_fg = grouped["league_fg"].to_numpy()
+        bubble_max = self.cube.levels[self.current_level].bubble_max
+
+        # Existing tooltips point at the old bubbles
+        with tracing.span("update.cursor"):
+            if self.cursor is not None:
+                for sel in list(self.cursor.selections):
+                    self.cursor.remove_selection(sel)
+
+        # Update the bubbles in place
+        with tracing.span("update.scatter"):
+            self.scatter.set_offsets(grouped[["x", "y"]].to_numpy())
+            self.scatter.set_sizes(bubble_sizes(self._counts, max_size=bubble_max))
+            self.scatter.set_array(self._bubble_colors())
+
+        # Surface mode hides the bubbles (and their hover) and shows the surface
+        show_surface = self.render_mode == "Surface"
+        self.scatter.set_visible(not show_surface)
+        self.surface.set_visible(show_surface)
+        if show_surface:
+            with tracing.span("update.surface"):
+                self._update_surface()
+
+        # Update the size legend entries
+        ref_counts = legend_counts(self._counts)
+        ref_sizes = bubble_sizes(ref_counts, max_size=bubble_max)
+        self.size_legend.set_visible(len(grouped) > 0 and not show_surface)
+        for i, (handle, label) in enumerate(
+            zip(self.size_legend.legend_handles, self.size_legend.get_texts())
+        ):
+            shown = i < len(ref_counts)
+            handle.set_visible(shown)
+            label.set_visible(shown)
+            if shown:
+                handle.set_sizes([ref_sizes[i]])
+                label.set_text(f"{ref_counts[i]} shots")
+
+        if self.trace_text is not None:
+            self._update_trace_overlay(tracing.spans_since(trace_start))
+
+        draw_start = tracing.mark()
+        with tracing.span("update.draw"):
+            self._redraw()
+        if self.trace_text is not None:
+            self._last_draw_time = sum(t for _, t in tracing.spans_since(draw_start))
+
+        if self.prefetcher is not None:
+            self.prefetcher.schedule(self.neighbor_keys(key))
+
+
+# Columns the viewer actually uses
+VIEWER_COLUMNS = [
+    "TEAM_NAME", "PLAYER_ID", "PLAYER_NAME", "POSITION", "POSITION_GROUP",
+    "SEASON_1", "QUARTER", "SECS_LEFT_UNIFIED", "SHOT_MADE", "x_bin", "y_bin",
+    "BASIC_ZONE", "ZONE_NAME",
+]
+
+
+def load_shots(base_dir, columns=VIEWER_COLUMNS):
+    """
+    Load the cleaned shots, preferring the Parquet artifact written by
+    data_cleaning.py and falling back to the optional CSV export.
+    """
+    parquet_path = os.path.join(base_dir, "clean_shots_with_zones.parquet")
+    if os.path.exists(parquet_path):
+        df = pd.read_parquet(parquet_path, columns=columns)
 
-        # Base filter
-        filtered_df = self.df
-        filtered_df = filtered_df[filtered_df["TEAM_NAME"] == self.current_team]
+        # Streamed artifacts list categories in order of first appearance
+        for col in df.select_dtypes("category").columns:
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+        return df
 
-        # Quarter + time filtering
-        if self.current_quarter != "All Quarters":
-            filtered_df = filtered_df[
-                filtered_df["QUARTER"].astype(str) == self.current_quarter
-            ]
-            if self.time_slider is not None:
-                t_min, t_max = sorted(self.time_slider.val)
-                filtered_df = filtered_df[
-                    (filtered_df["SECS_LEFT_UNIFIED"] >= t_min)
-                    & (filtered_df["SECS_LEFT_UNIFIED"] <= t_max)
-                ]
+    # QUARTER holds "OT" next to numbers; read as text so chunks without
+    # overtime rows do not come back as ints
+    csv_path = os.path.join(base_dir, "clean_shots_with_zones.csv")
+    return pd.read_csv(csv_path, usecols=columns, dtype={"QUARTER": str})
 
-        # Position filtering
-        if self.current_position != "All Positions":
-            if self.current_position in filtered_df["POSITION_GROUP"].astype(str).unique():
-                filtered_df = filtered_df[
-                    filtered_df["POSITION_GROUP"].astype(str) == self.current_position
-                ]
-            else:
-                filtered_df = filtered_df[
-                    filtered_df["POSITION"].astype(str) == self.current_position
-                ]
-
-        # Season filtering
-        filtered_df = filtered_df[filtered_df["SEASON_1"] == self.current_year]
-
-        # Aggregate by 2×2 shot zones
-        grouped = (
-            filtered_df.groupby(["x_bin", "y_bin"])
-            .agg(
-                count=("SHOT_MADE", "size"),
-                fg=("SHOT_MADE", "mean"),
-            )
-            .reset_index()
-        )
 
-        # Player-level stats per zone
-        player_groups = (
-            filtered_df.groupby(["x_bin", "y_bin", "PLAYER_NAME"])
-            .agg(
-                player_shots=("SHOT_MADE", "size"),
-                player_fg=("SHOT_MADE", "mean"),
+def open_shots(base_dir, export=True):
+    """
+    The memory-mapped ShotStore exported from the current cleaned data
+    (data_cleaning.py --store). Without one, the store is exported once
+    from the Parquet artifact (unless export is False), so later starts
+    map the prebuilt cube instead of building it again. Falls back to
+    load_shots() when the data's clean_key is unknown or no store could
+    be exported.
+    """
+    from data_cleaning import artifact_key, store_columns
+
+    parquet_path = os.path.join(base_dir, "clean_shots_with_zones.parquet")
+    key = artifact_key(parquet_path)
+    store = open_store(base_dir, key=key)
+    if store is not None:
+        return store
+
+    if export and key is not None:
+        print(f"Exporting {STORE_NAME}/ for faster viewer starts...")
+        try:
+            write_store(
+                pd.read_parquet(parquet_path, columns=store_columns),
+                os.path.join(base_dir, STORE_NAME),
+                key,
             )
-            .reset_index()
-        )
+        except OSError as e:
+            print(f"Could not export {STORE_NAME}/: {e!r}")
+        # Another viewer exporting at the same time may have swapped in its
+        # (equally current) store, so check again rather than assume ours
+        store = open_store(base_dir, key=key)
+        if store is not None:
+            return store
+    return load_shots(base_dir)
 
-        # Center of each 2×2 zone in court coordinates
-        x_min, y_min = -50, 0
-        x_bin_width, y_bin_width = 2, 2
-        grouped["x"] = x_min + (grouped["x_bin"] + 0.5) * x_bin_width
-        grouped["y"] = y_min + (grouped["y_bin"] + 0.5) * y_bin_width
-
-        # Top players per zone
-        best_by_volume = (
-            player_groups.sort_values(
-                ["x_bin", "y_bin", "player_shots"],
-                ascending=[True, True, False],
-            )
-            .groupby(["x_bin", "y_bin"])
-            .first()
-        )
 
-        min_shots = 5
-        best_by_fg = (
-            player_groups[player_groups["player_shots"] >= min_shots]
-            .sort_values(
-                ["x_bin", "y_bin", "player_fg"],
-                ascending=[True, True, False],
-            )
-            .groupby(["x_bin", "y_bin"])
-            .first()
-        )
+def show_viewer(df):
+    """
+    Open the interactive shot chart for a cleaned frame (or ShotStore) and
+    block until it is closed.
+    """
+    start = time.perf_counter()
+    fig = plt.figure(figsize=(12, 7))
+    ax = plt.axes([0.1, 0.15, 0.8, 0.75])
+    
+    selector = TeamSelector(df, fig, ax)
 
-        # Bubble sizes (sqrt scaling)
-        min_size = 20
-        scale_factor = 40
-
-        if len(grouped) > 0:
-            sizes = min_size + np.sqrt(grouped["count"]) * scale_factor
-            sizes = np.clip(sizes, min_size, 700)
-
-            self.scatter = self.ax.scatter(
-                grouped["x"],
-                grouped["y"],
-                s=sizes,
-                c=grouped["fg"],
-                cmap="viridis",
-                alpha=0.7,
-                zorder=10,
-                vmin=0,
-                vmax=1,
-            )
+    # Startup time: data in memory -> first chart on screen
+    def report_startup(event):
+        fig.canvas.mpl_disconnect(startup_cid)
+        print(f"First chart drawn {time.perf_counter() - start:.2f}s after loading the data")
 
-        # Tooltip with per-zone details
-        if hasattr(self, "cursor"):
-            self.cursor.remove()
-
-        if len(grouped) > 0:
-            self.cursor = mplcursors.cursor(self.scatter, hover=True)
-
-            @self.cursor.connect("add")
-            def on_hover(sel):
-                idx = sel.index
-                row = grouped.iloc[idx]
-                x_bin = row["x_bin"]
-                y_bin = row["y_bin"]
-                total_shots = row["count"]
-                fg = row["fg"]
-
-                if (x_bin, y_bin) in best_by_volume.index:
-                    bv = best_by_volume.loc[(x_bin, y_bin)]
-                    top_vol_player = bv["PLAYER_NAME"]
-                    top_vol_shots = int(bv["player_shots"])
-                else:
-                    top_vol_player = None
-                    top_vol_shots = 0
-
-                if (x_bin, y_bin) in best_by_fg.index:
-                    ba = best_by_fg.loc[(x_bin, y_bin)]
-                    top_acc_player = ba["PLAYER_NAME"]
-                    top_acc_fg = float(ba["player_fg"])
-                else:
-                    top_acc_player = None
-                    top_acc_fg = None
-
-                if top_vol_player is not None and top_acc_player is not None:
-                    text = (
-                        f"Shots: {total_shots}\n"
-                        f"FG%: {fg:.2f}\n\n"
-                        f"Top Player (Volume): {top_vol_player}\n"
-                        f"  Shots: {top_vol_shots}\n\n"
-                        f"Top Player (Accuracy): {top_acc_player}\n"
-                    )
-                elif top_vol_player is not None:
-                    text = (
-                        f"Shots: {total_shots}\n"
-                        f"FG%: {fg:.2f}\n\n"
-                        f"Top Player (Volume): {top_vol_player}\n"
-                        f"  Shots: {top_vol_shots}\n\n"
-                    )
-                else:
-                    text = (
-                        f"Shots: {total_shots}\n"
-                        f"FG%: {fg:.2f}\n\n"
-                        f"No qualifying players.\n"
-                    )
-
-                if top_acc_fg is not None:
-                    text += f"  FG%: {top_acc_fg:.2f}"
-
-                sel.annotation.set_text(text)
-                sel.annotation.get_bbox_patch().set(fc="white", alpha=0.9)
-
-        # Colorbar
-        if len(grouped) > 0:
-            if self.cbar is None:
-                self.cbar = plt.colorbar(self.scatter, ax=self.ax)
-                self.cbar.set_label("Field Goal Percentage (FG%)")
-                self.stable_position = self.ax.get_position()
-            else:
-                self.cbar.update_normal(self.scatter)
-
-        # --- Bubble-size legend (shots per zone) ---
-        if len(grouped) > 0:
-            # Use quantiles instead of min/max so labels are more interpretable
-            counts = grouped["count"].values
-            if counts.size == 1:
-                ref_counts = np.array([int(counts[0])])
-            else:
-                # 25th, 50th, 90th percentile
-                q = np.quantile(counts, [0.25, 0.5, 0.9])
-                ref_counts = np.unique(q.round().astype(int))
-                ref_counts = ref_counts[ref_counts > 0]  # no zero-shot labels
-                if ref_counts.size == 0:
-                    ref_counts = np.array([int(counts.max())])
-
-            # Compute legend bubble sizes using the exact same formula
-            ref_sizes = min_size + np.sqrt(ref_counts) * scale_factor
-            ref_sizes = np.clip(ref_sizes, min_size, 700)
-
-            # Remove previous legend if it exists
-            if self.size_legend is not None:
-                self.size_legend.remove()
-                self.size_legend = None
-
-            # Create dummy scatter handles so legend bubbles use the same 's'
-            handles = [
-                self.ax.scatter(
-                    [], [], s=s, color="gray", alpha=0.7, edgecolor="gray"
-                )
-                for s in ref_sizes
-            ]
-            labels = [f"{c} shots" for c in ref_counts]
-
-            self.size_legend = self.ax.legend(
-                handles,
-                labels,
-                title="Shots in Zone",
-                loc="upper right",
-                bbox_to_anchor=(1.32, 1.00),
-                frameon=True,
-            )
+    startup_cid = fig.canvas.mpl_connect("draw_event", report_startup)
+    
+    plt.show()
 
+    renders = selector.scheduler.stats()
+    print(
+        f"Slider renders: {renders['performed']} performed, "
+        f"{renders['skipped']} skipped of {renders['requested']} requested"
+    )
+    if tracing.enabled():
+        tracing.dump()
 
-        self.fig.canvas.draw_idle()
+    cache = selector.view_cache.stats()
+    print(
+        f"View cache: {cache['hits']} hits, {cache['misses']} misses "
+        f"({cache['hit_rate']:.0%}), {cache['entries']} views in {cache['bytes'] / 2**20:.1f} MB"
+    )
 
 
 def main():
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(base_dir, "clean_shots_with_zones.csv")
-
-    df = pd.read_csv(csv_path)
-
-    fig = plt.figure(figsize=(12, 7))
-    ax = plt.axes([0.1, 0.15, 0.8, 0.75])
-    
-    selector = TeamSelector(df, fig, ax)
-    
-    plt.show()
+    start = time.perf_counter()
+    df = open_shots(base_dir)
+    print(f"Loaded {len(df)} shots in {time.perf_counter() - start:.2f}s")
+    show_viewer(df)
 
 
 if __name__ == "__main__":
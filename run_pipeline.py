@@ -1,49 +1,122 @@
-import sys
-import subprocess
+import argparse
+import shutil
+import traceback
 from pathlib import Path
 
+import data_cleaning
+import draw_basketball_court
+import tracing
+from data_sources import make_source
+from shot_store import STORE_NAME, write_store
+
+
+def source_stage(ctx):
+    """Locate (and on first use download or generate) the season CSVs."""
+    ctx["path"] = make_source(ctx["args"].source).path()
+
+
+def clean_stage(ctx):
+    """
+    Reuse the cleaned Parquet file when it was made from the same inputs
+    and cleaning parameters/code, otherwise clean and rewrite it. Either
+    way the viewer gets the memory-mapped shot_store/ with its prebuilt
+    cube, exported once per cleaned dataset.
+    """
+    data_path = ctx["data_path"]
+    key = data_cleaning.clean_key(ctx["path"])
+
+    if not ctx["args"].force and data_cleaning.artifact_key(data_path) == key:
+        print(f"{data_path.name} is up to date. Skipping cleaning.")
+        ctx["shots"] = draw_basketball_court.open_shots(data_path.parent)
+        return
+
+    reason = "is stale" if data_path.exists() else "not found"
+    print(f"{data_path.name} {reason}. Cleaning...")
+    df_cleaned = data_cleaning.clean_all(ctx["path"], workers=ctx["args"].workers)
+    data_cleaning.write_artifact(df_cleaned, data_path, key)
+    print(f"Saved {data_path.name}")
+
+    # Export the column store (with its prebuilt cube) from the frame in
+    # memory, so the viewer maps the cube instead of building it on startup
+    base_dir = data_path.parent
+    write_store(df_cleaned[data_cleaning.store_columns], str(base_dir / STORE_NAME), key)
+    print(f"Saved {STORE_NAME}/")
+    ctx["shots"] = draw_basketball_court.open_shots(base_dir)
+
+
+def view_stage(ctx):
+    """Open the viewer on the cleaned shots."""
+    draw_basketball_court.show_viewer(ctx.pop("shots"))
+
+
+# Pipeline stages, run in order in this process
+stages = [
+    ("source", source_stage),
+    ("clean", clean_stage),
+    ("view", view_stage),
+]
+
+
+def run_stages(ctx):
+    for name, stage in stages:
+        with tracing.span(f"pipeline.{name}"):
+            stage(ctx)
+
 
 def main():
-    # CSV created by data_cleaning.py
+    parser = argparse.ArgumentParser(description="Clean the NBA shots dataset (if needed) and open the viewer.")
+    parser.add_argument(
+        "--source",
+        default="kaggle",
+        help='where season CSVs come from: "kaggle" (default), "local:<folder>" '
+             'or "synthetic:<rows>[:<seed>]"',
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes used to clean season files (default: CPU count)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="clean again even if the cleaned data is up to date",
+    )
+    args = parser.parse_args()
+
+    # Parquet artifact (and optional CSV export) created by the clean stage / data_cleaning.py
+    data_path = Path(__file__).with_name("clean_shots_with_zones.parquet")
     csv_path = Path(__file__).with_name("clean_shots_with_zones.csv")
+    store_path = Path(__file__).with_name(STORE_NAME)
 
     try:
-        # 1. Only run data_cleaning.py if CSV does NOT already exist
-        if csv_path.exists():
-            print(f"{csv_path.name} already exists. Skipping data_cleaning.py.")
-        else:
-            print(f"{csv_path.name} not found. Running data_cleaning.py...")
-            subprocess.run(
-                [sys.executable, "data_cleaning.py"],
-                check=True,
-            )
-
-        # 2. Run draw_basketball_court.py
-        print("Running draw_basketball_court.py...")
-        subprocess.run(
-            [sys.executable, "draw_basketball_court.py"],
-            check=True,
-        )
-
-    except subprocess.CalledProcessError as e:
-        # If either script fails, report the error but still go to the prompt below
-        print(f"Error while running: {e.cmd}")
-        print(e)
+        run_stages({"args": args, "data_path": data_path})
+
+    except Exception:
+        # If a stage fails, report the error but still go to the prompt below
+        print("Error while running the pipeline:")
+        traceback.print_exc()
 
     finally:
-        # 3. Ask whether to delete the CSV file
-        if csv_path.exists():
+        # Ask whether to delete the cleaned data files
+        outputs = [path for path in (data_path, csv_path, store_path) if path.exists()]
+        if outputs:
+            names = ", ".join(path.name for path in outputs)
             answer = input(
-                f"\nDo you want to delete {csv_path.name}? (Y/N): "
+                f"\nDo you want to delete {names}? (Y/N): "
             ).strip().lower()
 
             if answer in ("y", "yes"):
-                csv_path.unlink()
-                print(f"Deleted {csv_path.name}.")
+                for path in outputs:
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+                print(f"Deleted {names}.")
             else:
-                print(f"Keeping {csv_path.name}.")
+                print(f"Keeping {names}.")
         else:
-            print(f"\nNo CSV found at: {csv_path}")
+            print(f"\nNo cleaned data found at: {data_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,514 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import zones
+from view_cache import ViewCache
+
+# Memory budget for the shared top-player indexes (least recently used go first)
+PLAYER_INDEX_BYTES = 32 * 2**20
+
+
+def label_code(labels, value):
+    """Index of value in sorted labels, or None if it is not one of them."""
+    idx = int(np.searchsorted(labels, value))
+    if idx < len(labels) and labels[idx] == value:
+        return idx
+    return None
+
+
+def block_range(offsets, labels, team, season, quarter=None):
+    """
+    Slice of the rows (or cells) of one team and season, or of one of its
+    quarters, from an offset table over (team, season, quarter) blocks.
+    labels is the (teams, seasons, quarters) the blocks are numbered by.
+    """
+    teams, seasons, quarters = labels
+    team_idx, season_idx = label_code(teams, team), label_code(seasons, season)
+    if team_idx is None or season_idx is None:
+        return slice(0, 0)
+
+    first = (team_idx * len(seasons) + season_idx) * len(quarters)
+    if quarter is None:
+        return slice(int(offsets[first]), int(offsets[first + len(quarters)]))
+    quarter_idx = label_code(quarters, quarter)
+    if quarter_idx is None:
+        return slice(0, 0)
+    return slice(int(offsets[first + quarter_idx]), int(offsets[first + quarter_idx + 1]))
+
+
+def window_range(secs, rows, time_window):
+    """
+    Narrow a slice whose secs are sorted ascending to the inclusive
+    (t_min, t_max) time window, by binary search.
+    """
+    t_min, t_max = time_window
+    block = secs[rows]
+    return slice(
+        rows.start + int(np.searchsorted(block, t_min, side="left")),
+        rows.start + int(np.searchsorted(block, t_max, side="right")),
+    )
+
+
+class ZoneView:
+    """
+    Result of a ShotCube query at one zone level: per-zone totals plus the
+    filtered cells (level zone, player, attempts, makes) needed for the
+    top-player index.
+    """
+
+    def __init__(self, cube, level, fine_zone, area, player, attempts, makes):
+        self.cube = cube
+        self.level = level
+        self.fine_zone = fine_zone
+        self.player = player
+        self.attempts = attempts
+        self.makes = makes
+
+        if level.source == "grid":
+            # Dense fine-bin totals, then summed into the level's zones
+            fine_attempts, fine_makes = zones.zone_totals(
+                fine_zone, cube.num_x_bins * cube.num_y_bins, attempts, makes
+            )
+            self.zone = level.lut[fine_zone]
+            self.zone_attempts, self.zone_makes = zones.zone_totals(
+                level.lut, level.n_zones, fine_attempts, fine_makes
+            )
+        else:
+            self.zone = level.lut[area]
+            self.zone_attempts, self.zone_makes = zones.zone_totals(
+                self.zone, level.n_zones, attempts, makes
+            )
+
+    def zone_table(self):
+        """Per-zone counts and FG%, with the court position of each zone's bubble."""
+        nonzero = np.flatnonzero(self.zone_attempts)
+        count = self.zone_attempts[nonzero].astype(int)
+        return pd.DataFrame({
+            "zone": nonzero,
+            "x": self.level.x[nonzero],
+            "y": self.level.y[nonzero],
+            "count": count,
+            "fg": self.zone_makes[nonzero] / count,
+        })
+
+    def fine_totals(self):
+        """Attempts and makes per fine zone, whatever the level (for smoothed surfaces)."""
+        return zones.zone_totals(self.fine_zone, zones.n_zones, self.attempts, self.makes)
+
+    def player_index(self):
+        """Per-zone top-player index over the filtered cells."""
+        return ZonePlayerIndex(
+            self.zone, self.player, self.attempts, self.makes, self.level.n_zones,
+            self.cube.player_rank,
+        )
+
+
+class ZonePlayerIndex:
+    """
+    Shots and makes per (zone, player code), stored zone by zone with each
+    zone's players ordered by shots (most first, ties by name). Top-k by
+    volume is then the first k entries of a zone, and top-k by FG% one
+    linear pass over that zone's players.
+    """
+
+    def __init__(self, zone, player, attempts, makes, n_zones, player_rank):
+        zone, player, shots, made = zones.player_zone_totals(
+            zone, player, n_zones, attempts, makes
+        )
+
+        # player_rank is each player code's place in name order
+        order = np.lexsort((player_rank[player], -shots, zone))
+        self.zone = zone[order]
+        self.player = player[order]
+        self.shots = shots[order]
+        self.makes = made[order]
+
+    @property
+    def nbytes(self):
+        return self.zone.nbytes + self.player.nbytes + self.shots.nbytes + self.makes.nbytes
+
+    def _bounds(self, zone):
+        return np.searchsorted(self.zone, [zone, zone + 1])
+
+    def top_by_volume(self, zone, k=3):
+        """Up to k (player code, shots, makes) with the most shots in a zone."""
+        start, stop = self._bounds(zone)
+        stop = min(stop, start + k)
+        return list(zip(self.player[start:stop], self.shots[start:stop], self.makes[start:stop]))
+
+    def top_by_fg(self, zone, k=3, min_shots=5):
+        """Up to k (player code, shots, makes) with the best FG% among players with min_shots+."""
+        start, stop = self._bounds(zone)
+        # Shots are descending within a zone, so qualifying players come first
+        stop = start + np.searchsorted(-self.shots[start:stop], -min_shots, side="right")
+        fg = self.makes[start:stop] / self.shots[start:stop]
+        if len(fg) > k:
+            best = np.sort(np.argpartition(-fg, k - 1)[:k])
+        else:
+            best = np.arange(len(fg))
+        # Stable sort keeps the higher-volume player first on equal FG%
+        best = best[np.argsort(-fg[best], kind="stable")] + start
+        return list(zip(self.player[best], self.shots[best], self.makes[best]))
+
+
+class ShotCube:
+    """
+    Shot attempts and makes aggregated once at load time, indexed by
+    team × season × quarter × position × seconds-left × zone × area × player.
+
+    Zones are the fine bins written by cleaning, with each cell also
+    tagged with its court area; zones.py turns them into the coarser levels.
+
+    A fully dense array over all of those dimensions would need several GB,
+    so the non-empty cells are stored as flat integer columns sorted by
+    (team, season, quarter, seconds left, ...) with an offset table per
+    (team, season, quarter). A query is then a slice of that block (narrowed
+    to a time window by binary search), a position mask over its few
+    thousand cells and a bincount into dense per-zone arrays.
+
+    df is the cleaned shots, as a DataFrame or an open ShotStore.
+    """
+
+    def __init__(self, df):
+        # Dimension labels and each row's code along every dimension
+        self.teams, team = self._dimension(df, "TEAM_NAME")
+        self.seasons, season = self._labels_and_codes(
+            self._column(df, "SEASON_1").astype(int), as_str=False
+        )
+        self.quarters, quarter = self._dimension(df, "QUARTER")
+
+        # Players are keyed by PLAYER_ID; players lists each ID's name, with
+        # the ID appended where several IDs share a name
+        self.player_ids, player = self._labels_and_codes(
+            self._column(df, "PLAYER_ID").astype(np.int64), as_str=False
+        )
+        names, name = self._dimension(df, "PLAYER_NAME")
+        id_name = np.zeros(len(self.player_ids), dtype=np.int64)
+        id_name[player] = name
+        self.players = self._player_labels(self.player_ids, names[id_name])
+
+        # A position code stands for one (POSITION_GROUP, POSITION) pair,
+        # an area code for one (BASIC_ZONE, ZONE_NAME) pair
+        (self.position_groups, self.positions), position = self._pair_codes(
+            df, ["POSITION_GROUP", "POSITION"]
+        )
+        (self.area_basic, self.area_names), area = self._pair_codes(df, zones.area_cols)
+
+        # Fine zone grid (zone code = zones.zone_id(x_bin, y_bin, num_y_bins))
+        x_bin = self._column(df, "x_bin").astype(np.int64)
+        y_bin = self._column(df, "y_bin").astype(np.int64)
+        self.num_x_bins = zones.num_x_bins
+        self.num_y_bins = zones.num_y_bins
+
+        secs = self._column(df, "SECS_LEFT_UNIFIED").astype(np.int64)
+        zone = zones.zone_id(x_bin, y_bin, self.num_y_bins)
+        zones.check_zones(zone, zones.n_zones)
+        made = self._column(df, "SHOT_MADE").astype(np.int64)
+
+        # Court areas are drawn at their mean shot location
+        area_shots = np.bincount(area, minlength=len(self.area_names))
+        self.area_x = np.bincount(
+            area, weights=zones.bin_center(x_bin, zones.x_min, zones.fine_bin_width)
+        ) / np.maximum(area_shots, 1)
+        self.area_y = np.bincount(
+            area, weights=zones.bin_center(y_bin, zones.y_min, zones.fine_bin_width)
+        ) / np.maximum(area_shots, 1)
+
+        # Collapse identical cells into one (attempts, makes) entry
+        dims = (
+            len(self.teams), len(self.seasons), len(self.quarters),
+            int(secs.max()) + 1, len(self.positions),
+            self.num_x_bins * self.num_y_bins, len(self.area_names), len(self.players),
+        )
+        key = np.ravel_multi_index(
+            (team, season, quarter, secs, position, zone, area, player), dims
+        )
+        keys, inverse = np.unique(key, return_inverse=True)
+        self.cell_attempts = np.bincount(inverse).astype(np.uint32)
+        self.cell_makes = np.bincount(inverse, weights=made).astype(np.uint32)
+
+        team, season, quarter, secs, position, zone, area, player = np.unravel_index(keys, dims)
+        self.cell_position = position.astype(np.uint8)
+        self.cell_secs = secs.astype(np.uint16)
+        self.cell_zone = zone.astype(np.uint16)
+        self.cell_area = area.astype(np.uint16)
+        self.cell_player = player.astype(np.uint32)
+
+        # Cells are sorted by team, season, quarter then seconds left, so
+        # each (team, season, quarter) block is a contiguous range
+        # [offsets[b], offsets[b + 1]) ordered by seconds left
+        block = (team * len(self.seasons) + season) * len(self.quarters) + quarter
+        self.offsets = np.searchsorted(
+            block, np.arange(len(self.teams) * len(self.seasons) * len(self.quarters) + 1)
+        )
+
+        # Per-player index: cell numbers ordered by player, season, quarter
+        # then seconds left, with an offset per (player, season, quarter)
+        # block, so one player's chart never scans the other players' cells
+        self.player_cells = np.lexsort((secs, quarter, season, player)).astype(np.uint32)
+        player_block = (player * len(self.seasons) + season) * len(self.quarters) + quarter
+        self.player_offsets = np.concatenate([[0], np.cumsum(np.bincount(
+            player_block,
+            minlength=len(self.players) * len(self.seasons) * len(self.quarters),
+        ))])
+
+        # League baseline over every team: attempts/makes per (season,
+        # quarter) and fine zone or court area, plus cell numbers ordered by
+        # season, quarter then seconds left for baselines over a time window
+        season_quarter = season * len(self.quarters) + quarter
+        n_fine = self.num_x_bins * self.num_y_bins
+        self.league_zone_attempts, self.league_zone_makes = self._league_table(
+            season_quarter, zone, n_fine
+        )
+        self.league_area_attempts, self.league_area_makes = self._league_table(
+            season_quarter, area, len(self.area_names)
+        )
+        self.league_cells = np.lexsort((secs, season_quarter)).astype(np.uint32)
+        self.league_offsets = np.concatenate([[0], np.cumsum(np.bincount(
+            season_quarter, minlength=len(self.seasons) * len(self.quarters)
+        ))])
+
+        self._build_levels()
+
+    # Arrays written by save() and mapped back by load()
+    array_names = [
+        "teams", "seasons", "quarters", "player_ids", "players", "position_groups", "positions",
+        "area_basic", "area_names", "area_x", "area_y",
+        "cell_attempts", "cell_makes", "cell_position",
+        "cell_secs", "cell_zone", "cell_area", "cell_player", "offsets",
+        "player_cells", "player_offsets",
+        "league_zone_attempts", "league_zone_makes", "league_area_attempts",
+        "league_area_makes", "league_cells", "league_offsets",
+    ]
+
+    def save(self, cube_dir):
+        """Write the cube as one .npy file per array."""
+        os.makedirs(cube_dir, exist_ok=True)
+        for name in self.array_names:
+            values = getattr(self, name)
+            if values.dtype == object:
+                values = values.astype(str)
+            np.save(os.path.join(cube_dir, f"{name}.npy"), values)
+        np.save(
+            os.path.join(cube_dir, "grid.npy"),
+            np.array([self.num_x_bins, self.num_y_bins]),
+        )
+
+    @classmethod
+    def load(cls, cube_dir, mmap_mode="r"):
+        """
+        Open a cube written by save(). With mmap_mode="r" the arrays are
+        memory-mapped, so processes opening the same cube share one
+        page-cache copy instead of each holding its own.
+        """
+        cube = cls.__new__(cls)
+        for name in cls.array_names:
+            setattr(cube, name, np.load(os.path.join(cube_dir, f"{name}.npy"), mmap_mode=mmap_mode))
+        cube.num_x_bins, cube.num_y_bins = (
+            int(n) for n in np.load(os.path.join(cube_dir, "grid.npy"))
+        )
+        cube._build_levels()
+        return cube
+
+    def _build_levels(self):
+        """Zone pyramid over the fine grid, plus the court-area level."""
+        self.levels = {
+            f"{width} ft": zones.grid_level(width, self.num_x_bins, self.num_y_bins)
+            for width in zones.grid_widths
+        }
+        self.levels[zones.AREA_LEVEL] = zones.area_level(self.area_x, self.area_y)
+
+        # Place of each player code in name order, for top-player ties
+        self.player_rank = np.argsort(np.argsort(self.players, kind="stable"))
+
+        # Top-player indexes per (team, season, quarter, level), built on first use
+        self._player_indexes = ViewCache(max_bytes=PLAYER_INDEX_BYTES)
+
+    def _league_table(self, season_quarter, zone, n_zones):
+        """Dense (season, quarter, zone) attempts and makes summed over all cells."""
+        shape = (len(self.seasons), len(self.quarters), n_zones)
+        return (
+            totals.reshape(shape).astype(np.uint32)
+            for totals in zones.zone_totals(
+                season_quarter * n_zones + zone, int(np.prod(shape)),
+                self.cell_attempts, self.cell_makes,
+            )
+        )
+
+    def league_baseline(self, season, quarter=None, time_window=None,
+                        level=zones.DEFAULT_LEVEL):
+        """
+        League-wide (attempts, makes) per zone of a level for one season
+        and optional quarter / time window (as in query()). Whole seasons
+        and quarters are read from the precomputed tables; a time window
+        sums the league's cells in that quarter's slice.
+        """
+        zone_level = self.levels[level]
+        season_idx = label_code(self.seasons, season)
+        quarter_idx = None if quarter is None else label_code(self.quarters, quarter)
+        if season_idx is None or (quarter is not None and quarter_idx is None):
+            empty = np.zeros(zone_level.n_zones)
+            return empty, empty
+
+        if quarter is not None and time_window is not None:
+            block = season_idx * len(self.quarters) + quarter_idx
+            cells = self.league_cells[
+                self.league_offsets[block]:self.league_offsets[block + 1]
+            ].astype(np.int64)
+            cells = cells[window_range(self.cell_secs[cells], slice(0, len(cells)), time_window)]
+            view = self._view(cells, slice(None), level)
+            return view.zone_attempts, view.zone_makes
+
+        if zone_level.source == "grid":
+            attempts, makes = self.league_zone_attempts, self.league_zone_makes
+        else:
+            attempts, makes = self.league_area_attempts, self.league_area_makes
+        if quarter is None:
+            attempts, makes = attempts[season_idx].sum(axis=0), makes[season_idx].sum(axis=0)
+        else:
+            attempts, makes = attempts[season_idx, quarter_idx], makes[season_idx, quarter_idx]
+        return zones.zone_totals(zone_level.lut, zone_level.n_zones, attempts, makes)
+
+    def player_seasons(self, player_id):
+        """Seasons in which a player (PLAYER_ID) took at least one shot."""
+        player_idx = label_code(self.player_ids, player_id)
+        if player_idx is None:
+            return []
+        n_blocks = len(self.seasons) * len(self.quarters)
+        first = player_idx * n_blocks
+        counts = np.diff(self.player_offsets[first:first + n_blocks + 1])
+        counts = counts.reshape(len(self.seasons), len(self.quarters)).sum(axis=1)
+        return [int(season) for season in self.seasons[counts > 0]]
+
+    def team_seasons(self):
+        """(team, season) pairs that have at least one shot."""
+        counts = np.diff(self.offsets).reshape(
+            len(self.teams), len(self.seasons), len(self.quarters)
+        ).sum(axis=2)
+        return [
+            (str(self.teams[t]), int(self.seasons[s]))
+            for t, s in zip(*np.nonzero(counts))
+        ]
+
+    @staticmethod
+    def _column(source, col):
+        """One numeric column of a DataFrame or ShotStore as a NumPy array."""
+        if hasattr(source, "column"):
+            return source.column(col)
+        return source[col].to_numpy()
+
+    @classmethod
+    def _dimension(cls, source, col):
+        """Sorted labels and row codes of a DataFrame column or ShotStore dictionary."""
+        if hasattr(source, "dictionary"):
+            labels, codes = source.dictionary(col)
+            return labels, codes.astype(np.int64)
+        return cls._labels_and_codes(source[col])
+
+    @staticmethod
+    def _labels_and_codes(column, as_str=True):
+        """
+        Sorted distinct values of a column and each row's index into them.
+        Factorizing (categorical codes when available) avoids converting
+        every row to a string; only the distinct values are converted, and
+        values that become the same string (e.g. 4 and "4" in a mixed CSV
+        column) are merged into one label.
+        """
+        codes, uniques = pd.factorize(column)
+        uniques = np.asarray(uniques)
+        if as_str:
+            uniques = uniques.astype(str)
+        labels, rank = np.unique(uniques, return_inverse=True)
+        return labels, rank.reshape(-1)[codes]
+
+    @staticmethod
+    def _player_labels(ids, names):
+        """Display label per player ID: the name, plus " (ID)" where names repeat."""
+        _, inverse, counts = np.unique(names, return_inverse=True, return_counts=True)
+        shared = counts[inverse.reshape(-1)] > 1
+        return np.array([
+            f"{name} ({player_id})" if dup else str(name)
+            for player_id, name, dup in zip(ids, names, shared)
+        ])
+
+    @classmethod
+    def _pair_codes(cls, df, cols):
+        """Sorted distinct value pairs of two columns, and each row's pair code."""
+        (first, first_codes), (second, second_codes) = (
+            cls._dimension(df, col) for col in cols
+        )
+        # Few distinct pairs, so count them instead of sorting every row
+        pair = first_codes * len(second) + second_codes
+        pairs = np.flatnonzero(np.bincount(pair, minlength=len(first) * len(second)))
+        lookup = np.zeros(len(first) * len(second), dtype=np.int64)
+        lookup[pairs] = np.arange(len(pairs))
+        return [first[pairs // len(second)], second[pairs % len(second)]], lookup[pair]
+
+    def position_codes(self, position):
+        """Position codes matching a dropdown label (group first, then position)."""
+        if position in self.position_groups:
+            return np.flatnonzero(self.position_groups == position)
+        return np.flatnonzero(self.positions == position)
+
+    def player_index(self, team, season, quarter=None, level=zones.DEFAULT_LEVEL):
+        """
+        ZonePlayerIndex for a whole team/season/quarter slice (quarter None
+        means all quarters), computed once and reused by later views while
+        it stays within PLAYER_INDEX_BYTES.
+        """
+        key = (team, season, quarter, level)
+        index = self._player_indexes.get(key)
+        if index is None:
+            index = self.query(team, season, quarter=quarter, level=level).player_index()
+            self._player_indexes.put(key, index)
+        return index
+
+    def query(self, team, season, quarter=None, time_window=None, position=None,
+              level=zones.DEFAULT_LEVEL):
+        """
+        Return a ZoneView for the given filters at a zone level (a key of
+        self.levels). quarter/position of None mean "all"; time_window is an
+        inclusive (t_min, t_max) in seconds left and is only applied together
+        with a quarter.
+        """
+        cells = block_range(
+            self.offsets, (self.teams, self.seasons, self.quarters), team, season, quarter
+        )
+        if quarter is not None and time_window is not None:
+            cells = window_range(self.cell_secs, cells, time_window)
+
+        mask = np.ones(cells.stop - cells.start, dtype=bool)
+        if position is not None:
+            mask &= np.isin(self.cell_position[cells], self.position_codes(position))
+
+        return self._view(cells, mask, level)
+
+    def player_query(self, player_id, season, quarter=None, time_window=None,
+                     level=zones.DEFAULT_LEVEL):
+        """
+        ZoneView of one player's (PLAYER_ID) shots in a season, for every
+        team they played for, read through the per-player index. quarter
+        and time_window work as in query().
+        """
+        block = block_range(
+            self.player_offsets, (self.player_ids, self.seasons, self.quarters),
+            player_id, season, quarter,
+        )
+        cells = self.player_cells[block].astype(np.int64)
+        if quarter is not None and time_window is not None:
+            cells = cells[window_range(self.cell_secs[cells], slice(0, len(cells)), time_window)]
+        return self._view(cells, slice(None), level)
+
+    def _view(self, cells, mask, level):
+        """ZoneView of the cells selected by cells (a slice or cell numbers) and mask."""
+        return ZoneView(
+            self,
+            self.levels[level],
+            self.cell_zone[cells][mask].astype(np.int64),
+            self.cell_area[cells][mask].astype(np.int64),
+            self.cell_player[cells][mask].astype(np.int64),
+            self.cell_attempts[cells][mask],
+            self.cell_makes[cells][mask],
+        )
@@ -0,0 +1,196 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from shot_cube import ShotCube, block_range, window_range
+
+# Folder name of the store, next to clean_shots_with_zones.parquet
+STORE_NAME = "shot_store"
+
+# Layout version in meta.json; stores written with another layout are rebuilt
+STORE_VERSION = 6
+
+# Plain numeric columns, saved with these dtypes
+numeric_columns = {
+    "SEASON_1": "int16",
+    "TEAM_ID": "int32",
+    "PLAYER_ID": "int32",
+    "LOC_X": "float32",
+    "LOC_Y": "float32",
+    "x_bin": "int8",
+    "y_bin": "int8",
+    "SHOT_MADE": "bool",
+    "SECS_LEFT_UNIFIED": "int16",
+}
+
+# Dictionary-encoded columns: sorted labels plus one integer code per shot
+dictionary_columns = [
+    "TEAM_NAME", "PLAYER_NAME", "QUARTER", "POSITION", "POSITION_GROUP",
+    "BASIC_ZONE", "ZONE_NAME",
+]
+
+
+def write_store(df, store_dir, key=None):
+    """
+    Export the cleaned shots as a folder of .npy columns, plus the ShotCube
+    built from them; key is the clean_key() of the data. The folder is
+    written to a scratch folder of its own next to store_dir and swapped
+    in at the end, so readers never see a half-written store and several
+    processes can export at once (the last swap wins).
+
+    Rows are sorted by (team, season, quarter, seconds left) and index/
+    holds where every (team, season, quarter) block starts, so
+    ShotStore.rows() finds a slice without scanning the columns.
+    """
+    store_dir = os.path.abspath(store_dir)
+    tmp_dir = tempfile.mkdtemp(
+        prefix=os.path.basename(store_dir) + ".", suffix=".tmp", dir=os.path.dirname(store_dir)
+    )
+    try:
+        _write_store_files(df, tmp_dir, key)
+        _swap_in(tmp_dir, store_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _swap_in(new_dir, store_dir):
+    """
+    Move a finished store to store_dir. A current store is renamed aside
+    first (a folder cannot replace a non-empty one), so store_dir is only
+    missing for the moment between the two renames. If another export
+    swaps its store in at the same time, that store is kept instead.
+    """
+    old_dir = new_dir + ".old"
+    try:
+        os.rename(store_dir, old_dir)
+    except FileNotFoundError:
+        pass
+    try:
+        os.replace(new_dir, store_dir)
+    except OSError:
+        # Lost the race: store_dir already holds another export's store
+        pass
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _write_store_files(df, tmp_dir, key):
+    """Write the columns, dictionaries, index and cube of a store into tmp_dir."""
+    for folder in ("columns", "dicts", "index"):
+        os.makedirs(os.path.join(tmp_dir, folder))
+
+    dicts = {col: ShotCube._labels_and_codes(df[col]) for col in dictionary_columns}
+    seasons, season = ShotCube._labels_and_codes(
+        df["SEASON_1"].to_numpy().astype(int), as_str=False
+    )
+    (teams, team), (quarters, quarter) = dicts["TEAM_NAME"], dicts["QUARTER"]
+    order = np.lexsort((df["SECS_LEFT_UNIFIED"].to_numpy(), quarter, season, team))
+
+    block = (team * len(seasons) + season) * len(quarters) + quarter
+    block_rows = np.bincount(block, minlength=len(teams) * len(seasons) * len(quarters))
+    np.save(os.path.join(tmp_dir, "index", "seasons.npy"), seasons)
+    np.save(
+        os.path.join(tmp_dir, "index", "offsets.npy"),
+        np.concatenate([[0], np.cumsum(block_rows)]),
+    )
+
+    for col, dtype in numeric_columns.items():
+        np.save(
+            os.path.join(tmp_dir, "columns", f"{col}.npy"),
+            df[col].to_numpy().astype(dtype)[order],
+        )
+
+    for col, (labels, codes) in dicts.items():
+        np.save(os.path.join(tmp_dir, "dicts", f"{col}.npy"), labels)
+        np.save(
+            os.path.join(tmp_dir, "columns", f"{col}.npy"),
+            codes.astype(np.min_scalar_type(max(len(labels) - 1, 0)))[order],
+        )
+
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({"rows": len(df), "clean_key": key, "version": STORE_VERSION}, f)
+
+    ShotCube(ShotStore(tmp_dir)).save(os.path.join(tmp_dir, "cube"))
+
+
+class ShotStore:
+    """
+    Read-only view of a store written by write_store(). Columns are
+    memory-mapped, so any number of viewers and batch workers on one
+    machine share a single page-cache copy of the data.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+        self.n_rows = meta["rows"]
+        self.clean_key = meta["clean_key"]
+        self.version = meta.get("version", 1)
+        self._columns = {}
+
+        # Offset index over (team, season, quarter) blocks, and the labels
+        # numbering them (not present in stores with an older layout)
+        if self.version == STORE_VERSION:
+            self.offsets = np.load(os.path.join(store_dir, "index", "offsets.npy"))
+            self.index_labels = (
+                np.load(os.path.join(store_dir, "dicts", "TEAM_NAME.npy")),
+                np.load(os.path.join(store_dir, "index", "seasons.npy")),
+                np.load(os.path.join(store_dir, "dicts", "QUARTER.npy")),
+            )
+
+    def __len__(self):
+        return self.n_rows
+
+    def column(self, col):
+        """Memory-mapped values (or dictionary codes) of one column."""
+        if col not in self._columns:
+            self._columns[col] = np.load(
+                os.path.join(self.store_dir, "columns", f"{col}.npy"), mmap_mode="r"
+            )
+        return self._columns[col]
+
+    def dictionary(self, col):
+        """(sorted labels, per-shot codes) of a dictionary-encoded column."""
+        labels = np.load(os.path.join(self.store_dir, "dicts", f"{col}.npy"))
+        return labels, self.column(col)
+
+    def rows(self, team, season, quarter=None, time_window=None):
+        """
+        Slice of the rows of one team and season (quarter None means all
+        quarters), read from the offset index. With a quarter, time_window
+        (inclusive seconds left) narrows it by binary search, so the cost
+        depends on the slice, not on the size of the store.
+        """
+        rows = block_range(self.offsets, self.index_labels, team, season, quarter)
+        if quarter is not None and time_window is not None:
+            rows = window_range(self.column("SECS_LEFT_UNIFIED"), rows, time_window)
+        return rows
+
+    @property
+    def cube_dir(self):
+        return os.path.join(self.store_dir, "cube")
+
+    def cube(self):
+        """The ShotCube saved with the store, memory-mapped."""
+        return ShotCube.load(self.cube_dir, mmap_mode="r")
+
+
+def open_store(base_dir, key):
+    """
+    The ShotStore in base_dir, or None if none has been exported, it has
+    an older layout or it was not exported from the cleaned data with
+    clean_key() key. A key of None (the data's key is unknown) cannot be
+    checked, so no store is accepted.
+    """
+    if key is None:
+        return None
+    store_dir = os.path.join(base_dir, STORE_NAME)
+    if not os.path.exists(os.path.join(store_dir, "meta.json")):
+        return None
+    store = ShotStore(store_dir)
+    if store.version != STORE_VERSION or store.clean_key != key:
+        return None
+    return store
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Tracing is off unless SHOT_TRACE is set (or enable() is called)
+_enabled = bool(os.environ.get("SHOT_TRACE"))
+_spans = deque(maxlen=100_000)
+_count = 0
+_lock = threading.Lock()
+
+# Returned by span() while tracing is off, so disabled spans cost one call
+_NULL_SPAN = nullcontext()
+
+TRACE_FILE = os.environ.get("SHOT_TRACE_FILE", "shot_trace.json")
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _count
+        duration = time.perf_counter() - self.start
+        with _lock:
+            _spans.append((_count, self.name, self.start, duration, threading.get_ident()))
+            _count += 1
+        return False
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def enabled():
+    return _enabled
+
+
+def span(name):
+    """Context manager timing one phase; a shared no-op when tracing is off."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def mark():
+    """Position in the span log, for use with spans_since()."""
+    with _lock:
+        return _count
+
+
+def spans_since(position, thread_only=True):
+    """(name, seconds) of spans recorded after mark() returned position."""
+    ident = threading.get_ident()
+    recent = []
+    with _lock:
+        for entry in reversed(_spans):
+            if entry[0] < position:
+                break
+            recent.append(entry)
+    recent.reverse()
+    return [
+        (name, duration)
+        for _, name, _, duration, tid in recent
+        if not thread_only or tid == ident
+    ]
+
+
+def dump(path=TRACE_FILE):
+    """Write the recorded spans as a Chrome trace (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    with _lock:
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for _, name, start, duration, tid in _spans
+        ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events}, f)
+    print(f"Saved {len(events)} trace spans to {path}")
@@ -0,0 +1,177 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def entry_nbytes(value):
+    """
+    Approximate memory held by a cached value: frames, arrays, indexes
+    with an nbytes attribute, strings, and (nested) dicts of them.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sum(entry_nbytes(item) for item in value.values())
+    return 0
+
+
+class ViewCache:
+    """
+    Bounded LRU cache of computed views, keyed by the full filter tuple
+    (team, season, quarter, time window, position, zone level, player).
+    Least recently used entries are evicted once the cached views exceed
+    max_bytes. Safe to share between the UI thread and a Prefetcher.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Hit/miss statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        """Return the cached view for key (marking it recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, replace=True):
+        """
+        Store a view, evicting least recently used views to stay under
+        max_bytes. With replace=False a view already cached under key is
+        kept (checked under the lock) and value is dropped.
+        """
+        size = entry_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                if not replace:
+                    return
+                self.nbytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            self._evict()
+
+    def resize(self, key):
+        """
+        Measure a cached view again after parts were added to it in place
+        (player index, tooltips, surfaces), evicting least recently used
+        views to stay under max_bytes.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            value, old_size = entry
+            size = entry_nbytes(value)
+            self.nbytes += size - old_size
+            if size > self.max_bytes:
+                del self._entries[key]
+                self.nbytes -= size
+                return
+            self._entries[key] = (value, size)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used views until the cache fits (lock held)."""
+        while self.nbytes > self.max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.nbytes -= old_size
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+        }
+
+
+class Prefetcher:
+    """
+    Computes likely-next views on a background thread and stores them in a
+    ViewCache. schedule() replaces whatever is still queued, so changing
+    filters cancels prefetches for the old selection; it never waits on
+    the worker.
+    """
+
+    def __init__(self, cache, compute):
+        self.cache = cache
+        self.compute = compute
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._closed = False
+
+        # Counters for checking how much work is done or thrown away
+        self.computed = 0
+        self.cancelled = 0
+
+        self._thread = threading.Thread(target=self._run, name="view-prefetch", daemon=True)
+        self._thread.start()
+
+    def schedule(self, keys):
+        """Replace the queued work with the uncached views among keys."""
+        keys = [key for key in keys if key not in self.cache]
+        with self._cond:
+            self.cancelled += len(self._queue)
+            self._queue = keys
+            self._cond.notify()
+
+    def cancel(self):
+        self.schedule([])
+
+    def close(self):
+        """Stop the worker after its current view."""
+        with self._cond:
+            self._closed = True
+            self._queue = []
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key = self._queue.pop(0)
+
+            if key in self.cache:
+                continue
+            # The UI thread may have cached this view while it was computed;
+            # keep its entry, which it may already be filling in on hover
+            self.cache.put(key, self.compute(key), replace=False)
+            self.computed += 1
+
+    def stats(self):
+        return {"computed": self.computed, "cancelled": self.cancelled}
@@ -0,0 +1,176 @@
+import functools
+
+import numpy as np
+
+# Half court in dataset coordinates:
+# LOC_X is in  [-50, 50], LOC_Y is in  [0, 50]
+x_min, x_max = -50, 50
+y_min, y_max = 0, 50
+
+# Cleaning stores the finest bins; every coarser level is summed from them
+fine_bin_width = 1
+
+# Fine grid size. Coordinates on the far edges (LOC_X == 50, LOC_Y == 50)
+# are clamped into the last bin, so zone codes are dense in [0, n_zones)
+num_x_bins = int((x_max - x_min) / fine_bin_width)
+num_y_bins = int((y_max - y_min) / fine_bin_width)
+n_zones = num_x_bins * num_y_bins
+
+# Square grid sizes offered by the viewer (feet, multiples of fine_bin_width)
+grid_widths = [1, 2, 5]
+
+# Dataset columns that name a court area (e.g. "Mid-Range" / "Left Side")
+area_cols = ["BASIC_ZONE", "ZONE_NAME"]
+
+# Level names, and the one shown by default (the original 2×2 zones)
+AREA_LEVEL = "Court areas"
+DEFAULT_LEVEL = "2 ft"
+FINE_LEVEL = f"{fine_bin_width} ft"
+
+# Gaussian smoothing kernels are cut off at this many standard deviations
+KERNEL_SIGMAS = 3
+
+
+def bin_index(loc, lo, n_bins, width=fine_bin_width):
+    """Bin of each coordinate for n_bins bins of `width` feet starting at lo, clamped into the grid."""
+    return np.clip(((np.asarray(loc) - lo) // width).astype(int), 0, n_bins - 1)
+
+
+def bin_center(bin_idx, lo, width):
+    """Court coordinate of the middle of each bin."""
+    return lo + (bin_idx + 0.5) * width
+
+
+def zone_id(x_bin, y_bin, num_y_bins):
+    """Zone code of a grid cell (x-major, so codes sort by x_bin then y_bin)."""
+    return x_bin * num_y_bins + y_bin
+
+
+def split_zone(zone, num_y_bins):
+    """(x_bin, y_bin) of zone codes made by zone_id()."""
+    return np.divmod(zone, num_y_bins)
+
+
+def check_zones(zone, n_zones):
+    """Raise ValueError unless every zone code is in [0, n_zones)."""
+    if len(zone) and (zone.min() < 0 or zone.max() >= n_zones):
+        raise ValueError(
+            f"zone codes must be in [0, {n_zones}), got [{zone.min()}, {zone.max()}]"
+        )
+
+
+def zone_totals(zone, n_zones, attempts=None, makes=None):
+    """
+    Dense attempts and makes per zone code, via np.bincount. Without
+    `attempts` every entry counts as one shot; `makes` is the made flag or
+    the per-entry make count.
+    """
+    check_zones(zone, n_zones)
+    total = np.bincount(zone, weights=attempts, minlength=n_zones)
+    made = np.bincount(zone, weights=makes, minlength=n_zones)
+    return total, made
+
+
+def player_zone_totals(zone, player, n_zones, attempts=None, makes=None):
+    """
+    Attempts and makes for every (zone, player) pair present, as
+    (zone, player, attempts, makes) ordered by player then zone. Players
+    are renumbered within the input first, so the combined
+    player × zone code stays small enough for a dense bincount.
+    """
+    check_zones(zone, n_zones)
+    players, local = np.unique(player, return_inverse=True)
+    code = local * n_zones + zone
+    total = np.bincount(code, weights=attempts, minlength=len(players) * n_zones)
+    made = np.bincount(code, weights=makes, minlength=len(players) * n_zones)
+
+    present = np.flatnonzero(total)
+    local, zone = np.divmod(present, n_zones)
+    return (
+        zone,
+        players[local],
+        total[present].astype(np.int64),
+        made[present].astype(np.int64),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def gaussian_matrix(n_bins, bandwidth):
+    """
+    n_bins × n_bins matrix that convolves one row of fine bins with a
+    Gaussian of standard deviation `bandwidth` feet (zero beyond the court
+    edge). Built once per size and bandwidth; read-only because it is shared.
+    """
+    sigma = bandwidth / fine_bin_width
+    radius = int(np.ceil(KERNEL_SIGMAS * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+
+    offset = np.arange(n_bins)[:, None] - np.arange(n_bins)[None, :]
+    matrix = np.where(
+        np.abs(offset) <= radius, kernel[np.clip(offset + radius, 0, 2 * radius)], 0.0
+    )
+    matrix.flags.writeable = False
+    return matrix
+
+
+def smooth_zones(values, bandwidth):
+    """
+    Gaussian-smoothed surface of per-fine-zone values (e.g. attempts), as a
+    (num_y_bins, num_x_bins) image. The blur is separable, so it is one
+    banded matrix product per axis over the binned grid, whatever the
+    number of shots behind it.
+    """
+    grid = np.asarray(values, dtype=float).reshape(num_x_bins, num_y_bins)
+    smoothed = gaussian_matrix(num_x_bins, bandwidth) @ grid @ gaussian_matrix(num_y_bins, bandwidth).T
+    return smoothed.T
+
+
+class ZoneLevel:
+    """
+    One level of the zone pyramid. lut maps every fine zone code (grid
+    levels) or court-area code (area level) to a zone of this level; x/y
+    are where each zone's bubble is drawn. width is a grid level's zone
+    size in feet (None for the area level).
+    """
+
+    def __init__(self, name, source, lut, x, y, bubble_max, width=None):
+        self.name = name
+        self.source = source
+        self.lut = lut
+        self.x = x
+        self.y = y
+        self.bubble_max = bubble_max
+        self.width = width
+
+    @property
+    def n_zones(self):
+        return len(self.x)
+
+
+def grid_level(width, num_x_bins, num_y_bins):
+    """Square zones of `width` feet, each the sum of the fine bins it covers."""
+    factor = width // fine_bin_width
+    fine_x, fine_y = split_zone(np.arange(num_x_bins * num_y_bins), num_y_bins)
+    coarse_x_bins = -(-num_x_bins // factor)
+    coarse_y_bins = -(-num_y_bins // factor)
+
+    lut = zone_id(fine_x // factor, fine_y // factor, coarse_y_bins)
+    x_bin, y_bin = split_zone(np.arange(coarse_x_bins * coarse_y_bins), coarse_y_bins)
+    return ZoneLevel(
+        f"{width} ft",
+        "grid",
+        lut,
+        bin_center(x_bin, x_min, width),
+        bin_center(y_bin, y_min, width),
+        # Bigger zones hold more shots, so they may draw bigger bubbles
+        bubble_max=700 * max(width / 2, 0.5),
+        width=width,
+    )
+
+
+def area_level(area_x, area_y):
+    """One zone per court area, drawn at the area's mean shot location."""
+    return ZoneLevel(
+        AREA_LEVEL, "area", np.arange(len(area_x)), area_x, area_y, bubble_max=2500
+    )